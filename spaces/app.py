@@ -9,6 +9,19 @@ from typing import Any
 
 import gradio as gr
 
+from flagguard.analysis import ConflictDetector, FlagSATSolver
+from flagguard.parsers import parse_config
+from flagguard.reporters import MarkdownReporter
+
+_MERMAID_SAFE = str.maketrans("-.", "__")
+
+_SUMMARY_TEMPLATE = """## Analysis Results
+
+**Status:** {status}
+**Flags Analyzed:** {flags}
+**Conflicts Found:** {conflicts}
+"""
+
 
 def analyze_flags(
     config_file: Any,
@@ -27,10 +40,6 @@ def analyze_flags(
         return "Please upload a configuration file.", "", ""
     
     try:
-        from flagguard.parsers import parse_config
-        from flagguard.analysis import FlagSATSolver, ConflictDetector
-        from flagguard.reporters import MarkdownReporter
-        
         # Parse configuration
         config_path = Path(config_file.name)
         flags = parse_config(config_path)
@@ -43,24 +52,25 @@ def analyze_flags(
         
         # Generate summary
         status = "âœ… No conflicts" if not conflicts else f"âš ï¸ {len(conflicts)} conflicts found"
-        summary = f"""## Analysis Results
-
-**Status:** {status}
-**Flags Analyzed:** {len(flags)}
-**Conflicts Found:** {len(conflicts)}
-"""
+        summary = _SUMMARY_TEMPLATE.format(
+            status=status, flags=len(flags), conflicts=len(conflicts),
+        )
         
         # Generate report
         reporter = MarkdownReporter()
         report = reporter.generate_report(flags, conflicts, [], "")
         
         # Generate Mermaid graph
+        # Node ids cannot contain '-' or '.'; sanitize each name once
+        safe = {flag.name: flag.name.translate(_MERMAID_SAFE) for flag in flags}
         graph_lines = ["flowchart TD"]
         for flag in flags:
             style = ":::enabled" if flag.enabled else ":::disabled"
-            graph_lines.append(f"    {flag.name}[{flag.name}]{style}")
+            node = safe[flag.name]
+            graph_lines.append(f"    {node}[{flag.name}]{style}")
             for dep in flag.dependencies:
-                graph_lines.append(f"    {flag.name} --> {dep}")
+                dep_node = safe.get(dep) or dep.translate(_MERMAID_SAFE)
+                graph_lines.append(f"    {node} --> {dep_node}")
         graph_lines.extend([
             "",
             "    classDef enabled fill:#90EE90",
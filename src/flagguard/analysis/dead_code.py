@@ -50,20 +50,28 @@ class DeadCodeFinder:
             List of dead code blocks
         """
         self._dead_blocks.clear()
+        # Usages repeat the same few flags; ask the solver once per state
+        possible: dict[tuple[str, bool], bool] = {}
         
         for usage in usages:
-            dead_block = self._check_usage(usage)
+            dead_block = self._check_usage(usage, possible)
             if dead_block:
                 self._dead_blocks.append(dead_block)
         
         logger.info(f"Found {len(self._dead_blocks)} dead code blocks")
         return self._dead_blocks
     
-    def _check_usage(self, usage: FlagUsage) -> DeadCodeBlock | None:
+    def _check_usage(
+        self,
+        usage: FlagUsage,
+        possible: dict[tuple[str, bool], bool],
+    ) -> DeadCodeBlock | None:
         """Check if a flag usage leads to dead code.
         
         Args:
             usage: The flag usage to check
+            possible: Results of earlier state checks, keyed by
+                (flag name, required value); updated in place
             
         Returns:
             DeadCodeBlock if the code is dead, None otherwise
@@ -74,7 +82,11 @@ class DeadCodeFinder:
         
         state = {usage.flag_name: required_value}
         
-        if not self.solver.check_state_possible(state):
+        key = (usage.flag_name, required_value)
+        if key not in possible:
+            possible[key] = self.solver.check_state_possible(state)
+        
+        if not possible[key]:
             return DeadCodeBlock(
                 file_path=usage.file_path,
                 start_line=usage.line_number,
@@ -4,6 +4,7 @@ Provides a high-level interface for encoding flag relationships
 and checking for impossible states.
 """
 
+from functools import lru_cache
 from typing import Any
 
 from flagguard.core.logging import get_logger
@@ -18,6 +19,56 @@ except ImportError:
     Z3_AVAILABLE = False
     logger.warning("Z3 not available - SAT solving will be disabled")
 
+# Up to this many flags, satisfiable assignments are also tracked in a
+# truth table: one bit per assignment, 2**6 = 64 bits
+TRUTH_TABLE_MAX_FLAGS = 6
+
+
+@lru_cache(maxsize=None)
+def _assignments_with_flag(flag_count: int, bit: int, value: bool) -> int:
+    """Mask of the assignments of flag_count flags in which flag `bit` is value.
+
+    Assignment k gives flag i the value of bit i of k, so the mask for True
+    is runs of 2**bit zeros then 2**bit ones, repeated across all
+    2**flag_count bits; the mask for False is its complement.
+    """
+    width = 1 << bit
+    run = ((1 << width) - 1) << width
+    mask = 0
+    for offset in range(0, 1 << flag_count, 2 * width):
+        mask |= run << offset
+    return mask if value else mask ^ ((1 << (1 << flag_count)) - 1)
+
+
+# Z3 terms live in the process-wide context, so the same flag config
+# encoded again (by another solver, or for another analysis step) can
+# reuse them instead of going through z3's argument checks each time
+_TERM_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=_TERM_CACHE_SIZE)
+def _bool_term(flag: str) -> Any:
+    """Z3 boolean constant for a flag."""
+    return z3.Bool(flag)
+
+
+@lru_cache(maxsize=_TERM_CACHE_SIZE)
+def _literal_term(flag: str, value: bool) -> Any:
+    """Z3 literal asserting a flag has value."""
+    return _bool_term(flag) if value else z3.Not(_bool_term(flag))
+
+
+@lru_cache(maxsize=_TERM_CACHE_SIZE)
+def _requires_term(flag: str, required_flag: str) -> Any:
+    """Z3 term for flag => required_flag."""
+    return z3.Implies(_bool_term(flag), _bool_term(required_flag))
+
+
+@lru_cache(maxsize=_TERM_CACHE_SIZE)
+def _conflicts_term(flag1: str, flag2: str) -> Any:
+    """Z3 term for Not(flag1 AND flag2)."""
+    return z3.Not(z3.And(_bool_term(flag1), _bool_term(flag2)))
+
 
 class FlagSATSolver:
     """SAT solver for feature flag constraints.
@@ -35,6 +86,15 @@ class FlagSATSolver:
         """Initialize the solver."""
         self._solver: Any = None
         self._variables: dict[str, Any] = {}
+        # Keys of constraints already asserted, so repeats are skipped
+        self._asserted: set[tuple[str, ...]] = set()
+        # Values pinned by add_always_on/add_always_off
+        self._forced: dict[str, bool] = {}
+        # Bit k set if assignment k satisfies every constraint; None once
+        # there are more than TRUTH_TABLE_MAX_FLAGS flags
+        self._table: int | None = 1
+        # Flag -> its bit in a truth-table assignment, while there is a table
+        self._flag_bits: dict[str, int] = {}
         self.is_available = Z3_AVAILABLE
         
         if Z3_AVAILABLE:
@@ -47,6 +107,17 @@ class FlagSATSolver:
         if self._solver:
             self._solver.reset()
         self._variables.clear()
+        self._asserted.clear()
+        self._forced.clear()
+        self._table = 1
+        self._flag_bits.clear()
+    
+    def _is_new(self, key: tuple[str, ...]) -> bool:
+        """Record a constraint key, returning False if already asserted."""
+        if key in self._asserted:
+            return False
+        self._asserted.add(key)
+        return True
     
     def get_or_create_var(self, flag_name: str) -> Any:
         """Get or create a boolean variable for a flag.
@@ -61,9 +132,32 @@ class FlagSATSolver:
             return None
             
         if flag_name not in self._variables:
-            self._variables[flag_name] = z3.Bool(flag_name)
+            flag_count = len(self._variables)
+            if self._table is not None:
+                if flag_count == TRUTH_TABLE_MAX_FLAGS:
+                    self._table = None
+                    self._flag_bits.clear()
+                else:
+                    # The new flag is unconstrained: every assignment so far
+                    # stays satisfiable with it either off or on
+                    self._table |= self._table << (1 << flag_count)
+                    self._flag_bits[flag_name] = flag_count
+            self._variables[flag_name] = _bool_term(flag_name)
         return self._variables[flag_name]
     
+    def _literal_mask(self, flag: str, value: bool) -> int:
+        """Mask of the truth-table assignments in which flag has value."""
+        return _assignments_with_flag(len(self._variables), self._flag_bits[flag], value)
+    
+    def _exclude(self, *literals: tuple[str, bool]) -> None:
+        """Drop truth-table assignments in which all literals hold."""
+        if self._table is None:
+            return
+        excluded = -1
+        for flag, value in literals:
+            excluded &= self._literal_mask(flag, value)
+        self._table &= ~excluded
+    
     def add_requires(self, flag: str, required_flag: str) -> None:
         """Add a dependency constraint: flag requires required_flag.
         
@@ -73,14 +167,15 @@ class FlagSATSolver:
             flag: The dependent flag
             required_flag: The flag that is required
         """
-        if not self._solver:
+        if not self._solver or not self._is_new(("requires", flag, required_flag)):
             return
             
-        f = self.get_or_create_var(flag)
-        r = self.get_or_create_var(required_flag)
+        self.get_or_create_var(flag)
+        self.get_or_create_var(required_flag)
         
         # flag => required_flag
-        self._solver.add(z3.Implies(f, r))
+        self._solver.add(_requires_term(flag, required_flag))
+        self._exclude((flag, True), (required_flag, False))
         logger.debug(f"Added constraint: {flag} requires {required_flag}")
     
     def add_conflicts(self, flag1: str, flag2: str) -> None:
@@ -94,12 +189,16 @@ class FlagSATSolver:
         """
         if not self._solver:
             return
+        # Mutual exclusion is symmetric; flag configs often declare both sides
+        if not self._is_new(("conflicts", *sorted((flag1, flag2)))):
+            return
             
-        f1 = self.get_or_create_var(flag1)
-        f2 = self.get_or_create_var(flag2)
+        self.get_or_create_var(flag1)
+        self.get_or_create_var(flag2)
         
         # Not (flag1 AND flag2)
-        self._solver.add(z3.Not(z3.And(f1, f2)))
+        self._solver.add(_conflicts_term(flag1, flag2))
+        self._exclude((flag1, True), (flag2, True))
         logger.debug(f"Added conflict: {flag1} conflicts with {flag2}")
     
     def add_always_on(self, flag: str) -> None:
@@ -108,11 +207,13 @@ class FlagSATSolver:
         Args:
             flag: The flag that must be enabled
         """
-        if not self._solver:
+        if not self._solver or not self._is_new(("always_on", flag)):
             return
             
         f = self.get_or_create_var(flag)
         self._solver.add(f == True)
+        self._forced[flag] = True
+        self._exclude((flag, False))
     
     def add_always_off(self, flag: str) -> None:
         """Constrain a flag to always be False.
@@ -120,11 +221,13 @@ class FlagSATSolver:
         Args:
             flag: The flag that must be disabled
         """
-        if not self._solver:
+        if not self._solver or not self._is_new(("always_off", flag)):
             return
             
         f = self.get_or_create_var(flag)
         self._solver.add(f == False)
+        self._forced[flag] = False
+        self._exclude((flag, True))
     
     def check_state_possible(self, flag_states: dict[str, bool]) -> bool:
         """Check if a given flag state is satisfiable.
@@ -139,17 +242,25 @@ class FlagSATSolver:
             # If no solver, assume all states are possible
             return True
         
-        self._solver.push()
+        # A state contradicting a pinned flag is impossible without solving
+        for flag, value in flag_states.items():
+            if self._forced.get(flag, value) != value:
+                return False
+        
+        for flag in flag_states:
+            self.get_or_create_var(flag)
         
-        try:
+        if self._table is not None:
+            # Few flags: look the state up instead of calling Z3
+            matching = self._table
             for flag, value in flag_states.items():
-                var = self.get_or_create_var(flag)
-                self._solver.add(var == value)
-            
-            result = self._solver.check()
-            return result == z3.sat
-        finally:
-            self._solver.pop()
+                matching &= self._literal_mask(flag, value)
+            return matching != 0
+        
+        # Check under assumptions: nothing is asserted or retracted, and
+        # the solver keeps what it learned across calls
+        assumptions = [_literal_term(flag, value) for flag, value in flag_states.items()]
+        return self._solver.check(*assumptions) == z3.sat
     
     def get_impossible_states(
         self,
@@ -158,7 +269,11 @@ class FlagSATSolver:
     ) -> list[dict[str, bool]]:
         """Find impossible flag combinations.
         
-        Enumerates combinations of flags and checks which are impossible.
+        Rather than one satisfiability check per pair and value, asks Z3
+        once per flag value for every other flag it forces (its
+        consequences). A pair is impossible exactly when the first value is
+        unsatisfiable or forces the second flag to the opposite value, so
+        this takes 2 * len(flags) queries instead of four per pair.
         
         Args:
             flags: List of flag names to check
@@ -170,16 +285,44 @@ class FlagSATSolver:
         if not self._solver:
             return []
         
+        variables = [self.get_or_create_var(flag) for flag in flags]
+        index = {var.get_id(): i for i, var in enumerate(variables)}
+        
+        # forced[(i, val)] maps j -> the value flag j must take when flag i
+        # is val, or is None when flag i can never be val
+        forced: dict[tuple[int, bool], dict[int, bool] | None] = {}
+        undecided: set[tuple[int, bool]] = set()
+        for i, flag in enumerate(flags):
+            for val in (True, False):
+                literal = _literal_term(flag, val)
+                result, consequences = self._solver.consequences([literal], variables)
+                if result == z3.unsat:
+                    forced[(i, val)] = None
+                    continue
+                implied: dict[int, bool] = {}
+                for implication in consequences:
+                    consequent = implication.arg(1)
+                    negated = z3.is_not(consequent)
+                    if negated:
+                        consequent = consequent.arg(0)
+                    implied[index[consequent.get_id()]] = not negated
+                forced[(i, val)] = implied
+                if result != z3.sat:
+                    undecided.add((i, val))
+        
         impossible: list[dict[str, bool]] = []
         
         # Check pairwise combinations
         for i, flag1 in enumerate(flags):
-            for flag2 in flags[i + 1:]:
-                # Check all four combinations
-                for val1 in [True, False]:
-                    for val2 in [True, False]:
+            for j in range(i + 1, len(flags)):
+                flag2 = flags[j]
+                for val1 in (True, False):
+                    implied = forced[(i, val1)]
+                    for val2 in (True, False):
                         state = {flag1: val1, flag2: val2}
-                        if not self.check_state_possible(state):
+                        if implied is None or implied.get(j, val2) != val2:
+                            impossible.append(state)
+                        elif (i, val1) in undecided and not self.check_state_possible(state):
                             impossible.append(state)
         
         return impossible
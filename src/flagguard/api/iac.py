@@ -151,7 +151,8 @@ def _parse_yaml_iac(content: str, filename: str, source_type: str) -> tuple[list
     warnings = []
 
     try:
-        data = yaml.safe_load(content)
+        # libyaml-backed safe loader when PyYAML was built with it
+        data = yaml.load(content, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
     except Exception as e:
         warnings.append(f"YAML parse error: {str(e)}")
         return flags, warnings
@@ -59,12 +59,19 @@ def cli(debug: bool) -> None:
     default=True,
     help="Use LLM for explanations",
 )
+@click.option(
+    "--jobs", "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Worker processes for scanning large source trees (0 = one per CPU)",
+)
 def analyze(
     config: Path,
     source: Path,
     output: Optional[Path],
     format: str,
     use_llm: bool,
+    jobs: int,
 ) -> None:
     """Analyze feature flags for conflicts and dead code.
     
@@ -86,7 +93,7 @@ def analyze(
     
     with console.status("[bold green]Scanning source code..."):
         from flagguard.parsers.ast import SourceScanner
-        scanner = SourceScanner()
+        scanner = SourceScanner(max_workers=jobs or None)
         usages = scanner.scan_directory(source)
         console.print(
             f"✓ Scanned {usages.files_scanned} files, "
@@ -115,8 +122,9 @@ def analyze(
             client = OllamaClient()
             engine = ExplanationEngine(client, use_llm=client.is_available)
             
-            for conflict in conflicts[:10]:
-                conflict.llm_explanation = engine.explain_conflict(conflict)
+            top_conflicts = conflicts[:10]
+            for conflict, explanation in zip(top_conflicts, engine.explain_conflicts(top_conflicts)):
+                conflict.llm_explanation = explanation
             
             executive_summary = engine.generate_executive_summary(
                 len(flags), conflicts, dead_blocks
@@ -348,6 +356,12 @@ reporting:
     default=False,
     help="Save scan results to database",
 )
+@click.option(
+    "--jobs", "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Worker processes for scanning large source trees (0 = one per CPU)",
+)
 def scan(
     config: Optional[Path],
     source: Optional[Path],
@@ -355,6 +369,7 @@ def scan(
     output: Optional[Path],
     format: str,
     save: bool,
+    jobs: int,
 ) -> None:
     """Scan project for feature flag conflicts using .flagguard.yaml.
     
@@ -376,7 +391,10 @@ def scan(
     yaml_path = Path(".flagguard.yaml")
     if yaml_path.exists():
         try:
-            yaml_config = yaml.safe_load(yaml_path.read_text(encoding="utf-8")) or {}
+            yaml_config = yaml.load(
+                yaml_path.read_text(encoding="utf-8"),
+                Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader),
+            ) or {}
             console.print(f"[dim]✓ Loaded .flagguard.yaml[/dim]")
         except Exception as e:
             console.print(f"[yellow]⚠ Could not parse .flagguard.yaml: {e}[/yellow]")
@@ -428,7 +446,7 @@ def scan(
     if source_paths:
         with console.status("[bold green]Scanning source code..."):
             from flagguard.parsers.ast import SourceScanner
-            scanner = SourceScanner()
+            scanner = SourceScanner(max_workers=jobs or None)
             
             exclude = yaml_config.get("exclude_patterns", [])
             
@@ -465,8 +483,9 @@ def scan(
                 client = OllamaClient()
                 engine = ExplanationEngine(client, use_llm=client.is_available)
                 
-                for conflict in conflicts[:10]:
-                    conflict.llm_explanation = engine.explain_conflict(conflict)
+                top_conflicts = conflicts[:10]
+                for conflict, explanation in zip(top_conflicts, engine.explain_conflicts(top_conflicts)):
+                    conflict.llm_explanation = explanation
                 
                 executive_summary = engine.generate_executive_summary(
                     len(flags), conflicts, dead_blocks
@@ -4,9 +4,13 @@ from dataclasses import dataclass, field
 from typing import Any, List, Optional, Set
 
 
-@dataclass
+@dataclass(slots=True)
 class FlagUsage:
-    """A location where a feature flag is checked in source code."""
+    """A location where a feature flag is checked in source code.
+    
+    Slotted, as scans create one per flag check; left mutable because a
+    frozen dataclass's __init__ is several times slower to construct.
+    """
     flag_name: str
     file_path: str
     line_number: int
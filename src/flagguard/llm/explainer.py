@@ -1,5 +1,6 @@
 """Explanation engine that uses LLM to generate human-readable explanations."""
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 from flagguard.core.models import Conflict, DeadCodeBlock
@@ -66,6 +67,30 @@ class ExplanationEngine:
         
         return explanation.strip()
     
+    def explain_conflicts(
+        self,
+        conflicts: list[Conflict],
+        max_workers: int = 5,
+    ) -> list[str]:
+        """Generate explanations for several conflicts concurrently.
+        
+        Each LLM call mostly waits on the Ollama server, so issuing them
+        from a small thread pool bounds total latency by the slowest call
+        rather than the sum of all calls.
+        
+        Args:
+            conflicts: Conflicts to explain
+            max_workers: Maximum concurrent LLM requests
+            
+        Returns:
+            Explanations in the same order as conflicts
+        """
+        if not self.use_llm or len(conflicts) <= 1:
+            return [self.explain_conflict(c) for c in conflicts]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(conflicts))) as executor:
+            return list(executor.map(self.explain_conflict, conflicts))
+    
     def explain_conflict_with_fix(
         self,
         conflict: Conflict,
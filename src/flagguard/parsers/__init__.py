@@ -7,11 +7,12 @@ This module provides parsers for various feature flag configuration formats:
 """
 
 from flagguard.parsers.base import BaseParser, ParserError
-from flagguard.parsers.factory import get_parser, parse_config
+from flagguard.parsers.factory import get_parser, parse_config, parse_config_text
 
 __all__ = [
     "BaseParser",
     "ParserError",
     "get_parser",
     "parse_config",
+    "parse_config_text",
 ]
@@ -4,11 +4,14 @@ Extracts feature flag usage patterns from JS/TS source files.
 """
 
 import re
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from flagguard.core.models import FlagUsage
 from flagguard.core.logging import get_logger
+from flagguard.parsers.ast.prefilter import TokenPrefilter
 
 logger = get_logger("javascript_extractor")
 
@@ -28,27 +31,118 @@ FLAG_PATTERNS = [
     r"ldClient\.variation\s*\(\s*['\"`]([^'\"`]+)['\"`]\s*",
 ]
 
+# Substrings at least one of which appears wherever a pattern above can
+# match; files with none of them are skipped without decoding or matching
+_PREFILTER_TOKENS = (
+    b"isEnabled", b"isFeatureEnabled", b"useFlag", b"useFeature",
+    b"variation", b"getFlag", b"hasFeature", b"checkFeature", b"flags",
+)
+_has_trigger = TokenPrefilter(_PREFILTER_TOKENS)
+
+# A NUL byte within this many leading bytes marks a file as binary; source
+# text never contains one
+_BINARY_SNIFF_BYTES = 4096
+
+# Function definition patterns used to find the enclosing function
+FUNCTION_PATTERNS = [
+    r"function\s+(\w+)\s*\(",
+    r"const\s+(\w+)\s*=\s*(?:async\s+)?(?:function|\([^)]*\)\s*=>|\w+\s*=>)",
+    r"let\s+(\w+)\s*=\s*(?:async\s+)?(?:function|\([^)]*\)\s*=>)",
+    r"(\w+)\s*:\s*(?:async\s+)?function\s*\(",
+    r"(?:async\s+)?(\w+)\s*\([^)]*\)\s*{",  # Method shorthand
+]
+
+# How far back to look for an enclosing function definition
+FUNCTION_LOOKBACK_LINES = 100
+
+# Files parsed with tree-sitter-javascript; TypeScript syntax does not parse
+# with that grammar, so other extensions stay on the regex path
+_TREE_SITTER_SUFFIXES = frozenset({".js", ".jsx", ".mjs", ".cjs"})
+
+# Flag-checking calls and flags["name"] lookups whose first argument or
+# index is a string literal. Compiled once per process (see _javascript_grammar).
+_FLAG_QUERY = """
+(call_expression
+  function: [
+    (identifier) @fn
+    (member_expression property: (property_identifier) @fn)
+  ]
+  arguments: (arguments . [(string) (template_string)] @arg)
+  (#any-of? @fn
+    "isEnabled" "isFeatureEnabled" "useFlag" "useFeature"
+    "variation" "getFlag" "hasFeature" "checkFeature")) @check
+(subscript_expression
+  object: (_) @obj
+  index: [(string) (template_string)] @arg
+  (#match? @obj "flags$")) @check
+"""
+
+# Enclosing node types that decide a check's type; the innermost one wins
+_CHECK_TYPES = {
+    "if_statement": "if",
+    "ternary_expression": "ternary",
+    "switch_statement": "switch",
+    "variable_declarator": "assignment",
+    "assignment_expression": "assignment",
+}
+
+# Function nodes named by their own "name" field
+_NAMED_FUNCTIONS = frozenset({
+    "function_declaration", "generator_function_declaration",
+    "method_definition", "function_expression",
+})
+
+# Anonymous functions take the name they are bound to, via these parents
+_BINDING_NAME_FIELDS = {
+    "variable_declarator": "name",
+    "pair": "key",
+    "assignment_expression": "left",
+}
+
+
+_COMPILED_PATTERNS = [re.compile(p) for p in FLAG_PATTERNS]
+_COMPILED_FUNCTION_PATTERNS = [re.compile(p) for p in FUNCTION_PATTERNS]
+
+
+@lru_cache(maxsize=1)
+def _javascript_grammar() -> tuple[Any, Any]:
+    """Load the JavaScript grammar and compile _FLAG_QUERY once per process.
+    
+    Raises:
+        ImportError: If tree-sitter or its JavaScript grammar is missing
+    """
+    import tree_sitter_javascript as ts_js
+    from tree_sitter import Language, Query
+    
+    language = Language(ts_js.language())
+    return language, Query(language, _FLAG_QUERY)
+
 
 class JavaScriptFlagExtractor:
     """Extracts feature flag usage from JavaScript/TypeScript source code.
     
-    Uses regex-based pattern matching. Tree-sitter support can be
-    added for more accurate parsing.
+    JavaScript files are parsed with tree-sitter when it is available, using
+    a prepared query so only flag checks are visited from Python. TypeScript
+    files, and everything when tree-sitter is missing, use regex-based
+    pattern matching.
     """
     
     def __init__(self) -> None:
         """Initialize the extractor."""
-        self._patterns = [re.compile(p) for p in FLAG_PATTERNS]
+        self._patterns = _COMPILED_PATTERNS
+        self._function_patterns = _COMPILED_FUNCTION_PATTERNS
         self._tree_sitter_available = False
         self._parser: Any = None
+        self._query: Any = None
         
-        # Try to initialize tree-sitter
+        # Try to initialize tree-sitter. Grammar and query are shared; each
+        # extractor gets its own parser, as parsers are not thread-safe.
         try:
-            import tree_sitter_javascript as ts_js
-            from tree_sitter import Language, Parser
+            from tree_sitter import Parser, QueryCursor
             
-            JS_LANGUAGE = Language(ts_js.language())
-            self._parser = Parser(JS_LANGUAGE)
+            language, self._query = _javascript_grammar()
+            self._parser = Parser(language)
+            self._cursor_type = QueryCursor
             self._tree_sitter_available = True
             logger.debug("tree-sitter JavaScript parser initialized")
         except ImportError:
@@ -64,14 +158,105 @@ class JavaScriptFlagExtractor:
             List of FlagUsage objects found
         """
         try:
-            content = file_path.read_text(encoding="utf-8")
+            data = file_path.read_bytes()
+            if not data or data.find(b"\x00", 0, _BINARY_SNIFF_BYTES) != -1:
+                return []
+            # Most files never mention a flag; skip decoding and matching them
+            if not _has_trigger(data):
+                return []
+            content = data.decode("utf-8")
         except Exception as e:
             logger.error(f"Failed to read {file_path}: {e}")
             return []
+        if "\r" in content:
+            # Match read_text()'s universal newline handling
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+            data = content.encode("utf-8")
         
-        # For now, use regex extraction (tree-sitter can be added later)
+        if self._tree_sitter_available and file_path.suffix.lower() in _TREE_SITTER_SUFFIXES:
+            return self._extract_with_tree_sitter(file_path, content, data)
         return self._extract_with_regex(file_path, content)
     
+    def _extract_with_tree_sitter(
+        self,
+        file_path: Path,
+        content: str,
+        source: bytes,
+    ) -> list[FlagUsage]:
+        """Extract flags using tree-sitter and the prepared flag query.
+        
+        The query runs in C and yields only flag checks; their enclosing
+        context is then read off each match's ancestors.
+        """
+        tree = self._parser.parse(source)
+        lines = content.splitlines()
+        file_str = str(file_path)
+        usages: list[FlagUsage] = []
+        
+        for _, captures in self._cursor_type(self._query).matches(tree.root_node):
+            arg = captures["arg"][0]
+            # Template literals with ${...} do not name a fixed flag
+            if arg.type == "template_string" and any(
+                child.type == "template_substitution" for child in arg.children
+            ):
+                continue
+            node = captures["check"][0]
+            function, class_name, negated, check_type = self._node_context(node)
+            
+            usages.append(FlagUsage(
+                flag_name=arg.text.decode("utf-8")[1:-1],
+                file_path=file_str,
+                line_number=node.start_point[0] + 1,
+                column=node.start_point[1],
+                end_line=node.end_point[0] + 1,
+                end_column=node.end_point[1],
+                containing_function=function,
+                containing_class=class_name,
+                check_type=check_type,
+                negated=negated,
+                code_snippet=lines[node.start_point[0]].strip() if lines else "",
+            ))
+        
+        return usages
+    
+    def _node_context(self, node: Any) -> tuple[str | None, str | None, bool, str]:
+        """Find a check's enclosing function, class, negation and check type."""
+        function: str | None = None
+        class_name: str | None = None
+        negated = False
+        check_type: str | None = None
+        
+        child = node
+        parent = node.parent
+        while parent is not None:
+            parent_type = parent.type
+            if parent_type == "unary_expression":
+                operator = parent.child_by_field_name("operator")
+                if operator is not None and operator.type == "!":
+                    negated = True
+            if check_type is None and parent_type in _CHECK_TYPES:
+                check_type = _CHECK_TYPES[parent_type]
+            # A declarator can both set the check type and name a function
+            if function is None:
+                if parent_type in _NAMED_FUNCTIONS:
+                    name_node = parent.child_by_field_name("name")
+                    if name_node is not None:
+                        function = name_node.text.decode("utf-8")
+                elif parent_type in _BINDING_NAME_FIELDS and child.type in (
+                    "arrow_function", "function_expression"
+                ):
+                    name_node = parent.child_by_field_name(_BINDING_NAME_FIELDS[parent_type])
+                    if name_node is not None:
+                        function = name_node.text.decode("utf-8")
+            if class_name is None and parent_type in ("class_declaration", "class"):
+                name_node = parent.child_by_field_name("name")
+                if name_node is not None:
+                    class_name = name_node.text.decode("utf-8")
+            child = parent
+            parent = parent.parent
+        
+        return function, class_name, negated, check_type or "expression"
+    
     def _extract_with_regex(
         self,
         file_path: Path,
@@ -80,6 +265,7 @@ class JavaScriptFlagExtractor:
         """Extract flags using regex patterns."""
         usages: list[FlagUsage] = []
         lines = content.splitlines()
+        function_index = self._build_function_index(lines)
         
         for line_num, line in enumerate(lines, start=1):
             for pattern in self._patterns:
@@ -91,7 +277,7 @@ class JavaScriptFlagExtractor:
                     
                     # Try to determine containing function
                     containing_func = self._find_containing_function(
-                        lines, line_num - 1
+                        function_index, line_num - 1
                     )
                     
                     usages.append(FlagUsage(
@@ -125,30 +311,41 @@ class JavaScriptFlagExtractor:
             return "assignment"
         return "expression"
     
-    def _find_containing_function(
+    def _build_function_index(
         self,
         lines: list[str],
+    ) -> tuple[list[int], list[str | None]]:
+        """Index function definitions and class lines in a single pass.
+        
+        Returns parallel lists of line indices and function names, where a
+        ``None`` name marks a class boundary.
+        """
+        line_indices: list[int] = []
+        names: list[str | None] = []
+        for i, line in enumerate(lines):
+            line = line.lstrip()
+            for pattern in self._function_patterns:
+                match = pattern.match(line)
+                if match:
+                    line_indices.append(i)
+                    names.append(match.group(1))
+                    break
+            else:
+                if line.startswith("class "):
+                    line_indices.append(i)
+                    names.append(None)
+        return line_indices, names
+    
+    def _find_containing_function(
+        self,
+        function_index: tuple[list[int], list[str | None]],
         current_line: int,
     ) -> str | None:
         """Find the function containing the current line."""
-        # Look backwards for function definitions
-        function_patterns = [
-            r"function\s+(\w+)\s*\(",
-            r"const\s+(\w+)\s*=\s*(?:async\s+)?(?:function|\([^)]*\)\s*=>|\w+\s*=>)",
-            r"let\s+(\w+)\s*=\s*(?:async\s+)?(?:function|\([^)]*\)\s*=>)",
-            r"(\w+)\s*:\s*(?:async\s+)?function\s*\(",
-            r"(?:async\s+)?(\w+)\s*\([^)]*\)\s*{",  # Method shorthand
-        ]
-        
-        for i in range(current_line, max(-1, current_line - 100), -1):
-            line = lines[i].lstrip()
-            for pattern in function_patterns:
-                match = re.match(pattern, line)
-                if match:
-                    return match.group(1)
-            
-            # Stop at class definition
-            if line.startswith("class "):
-                break
-        
-        return None
+        # Nearest preceding definition within the lookback window,
+        # stopping at class definitions
+        line_indices, names = function_index
+        pos = bisect_right(line_indices, current_line)
+        if not pos or line_indices[pos - 1] <= current_line - FUNCTION_LOOKBACK_LINES:
+            return None
+        return names[pos - 1]
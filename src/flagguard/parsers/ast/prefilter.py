@@ -0,0 +1,72 @@
+"""Token pre-scan deciding whether a source file needs parsing.
+
+Extractors run this over a file's raw bytes before decoding it; files
+without any of their trigger tokens cannot contain a flag check.
+"""
+
+import re
+import threading
+from typing import Any
+
+# Hyperscan is optional; it matches all tokens in one SIMD pass
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+
+def _stop_on_match(*_: Any) -> bool:
+    """Hyperscan match handler ending the scan at the first token found."""
+    return True
+
+
+class TokenPrefilter:
+    """Tests whether a buffer contains any of a fixed set of tokens.
+
+    With Hyperscan the tokens are compiled into a single database and the
+    buffer is scanned once. Otherwise each token is searched for in turn:
+    CPython's substring search beats a single ``re`` alternation over the
+    same tokens, which cannot skip ahead the way a literal search does.
+    """
+
+    def __init__(self, tokens: tuple[bytes, ...]) -> None:
+        """Initialize the prefilter.
+
+        Args:
+            tokens: Byte strings, any one of which makes a file relevant
+        """
+        self.tokens = tokens
+        self._database: Any = None
+        # Hyperscan scratch space may not be shared between threads
+        self._local = threading.local()
+
+        if HYPERSCAN_AVAILABLE:
+            database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            database.compile(
+                expressions=[re.escape(token) for token in tokens],
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(tokens),
+            )
+            self._database = database
+
+    def __call__(self, data: Any) -> bool:
+        """Check whether data contains any token.
+
+        Args:
+            data: bytes or another buffer, such as an mmap
+
+        Returns:
+            True if at least one token occurs in data
+        """
+        if self._database is None:
+            # find() rather than `in`, which mmap only supports for ints
+            return any(data.find(token) != -1 for token in self.tokens)
+
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self._database)
+        try:
+            self._database.scan(data, match_event_handler=_stop_on_match, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            return True
+        return False
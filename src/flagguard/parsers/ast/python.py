@@ -3,12 +3,18 @@
 Extracts feature flag usage patterns from Python source files.
 """
 
+import mmap
 import re
+import sys
+from bisect import bisect_right
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from flagguard.core.models import FlagUsage
 from flagguard.core.logging import get_logger
+from flagguard.parsers.ast.prefilter import TokenPrefilter
 
 logger = get_logger("python_extractor")
 
@@ -26,6 +32,80 @@ FLAG_PATTERNS = [
     r"feature_flags\.([a-zA-Z_][a-zA-Z0-9_]*)",
 ]
 
+_COMPILED_PATTERNS = [re.compile(p) for p in FLAG_PATTERNS]
+
+_DEF_PATTERN = re.compile(r"def\s+(\w+)\s*\(")
+
+# Flag-checking function names, matched against the last dotted segment
+_FLAG_FUNCS = frozenset({
+    "is_enabled", "is_feature_enabled", "feature_enabled",
+    "variation", "get_flag", "has_feature", "check_feature",
+})
+
+# Substrings at least one of which appears wherever a pattern above can
+# match; files with none of them are skipped without decoding or parsing
+_PREFILTER_TOKENS = (
+    b"is_enabled", b"feature_enabled", b"variation", b"get_flag",
+    b"has_feature", b"check_feature", b"flags",
+)
+_has_trigger = TokenPrefilter(_PREFILTER_TOKENS)
+
+# Node types that decide the check type of the calls nested in them; the
+# innermost one wins
+_CHECK_TYPES = {
+    "if_statement": "if",
+    "conditional_expression": "ternary",
+    "assignment": "assignment",
+    "match_statement": "match",
+}
+
+# Extraction results keyed by (path, mtime_ns, size, tree-sitter used), for
+# extractors created with cache_results=True (e.g. a test session parsing the
+# same fixtures repeatedly). A changed file gets a new key; the oldest
+# entries are evicted once the cache is full.
+_EXTRACT_CACHE: dict[tuple[str, int, int, bool], list[FlagUsage]] = {}
+_EXTRACT_CACHE_MAX_ENTRIES = 4096
+
+# Files at least this large are memory-mapped for the prefilter, so one
+# without a flag check is never copied into memory
+_MMAP_MIN_SIZE = 4 * 1024 * 1024
+
+# A NUL byte within this many leading bytes marks a file as binary; source
+# text never contains one
+_BINARY_SNIFF_BYTES = 4096
+
+
+def _read_if_relevant(file_path: Path, size: int) -> bytes | None:
+    """Read a file's bytes, or return None if it cannot contain a flag check.
+    
+    Binary files are rejected on their leading bytes, before any token
+    search or decoding.
+    """
+    if size < _MMAP_MIN_SIZE:
+        data = file_path.read_bytes()
+        if data.find(b"\x00", 0, _BINARY_SNIFF_BYTES) != -1:
+            return None
+        return data if _has_trigger(data) else None
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm.find(b"\x00", 0, _BINARY_SNIFF_BYTES) != -1:
+            return None
+        if _has_trigger(mm):
+            return mm[:]
+    return None
+
+
+@lru_cache(maxsize=1)
+def _python_language() -> Any:
+    """Load the tree-sitter Python grammar once per process.
+    
+    Raises:
+        ImportError: If tree-sitter or its Python grammar is missing
+    """
+    import tree_sitter_python as ts_python
+    from tree_sitter import Language
+    
+    return Language(ts_python.language())
+
 
 class PythonFlagExtractor:
     """Extracts feature flag usage from Python source code.
@@ -35,19 +115,24 @@ class PythonFlagExtractor:
     for more accurate extraction.
     """
     
-    def __init__(self) -> None:
-        """Initialize the extractor."""
-        self._patterns = [re.compile(p) for p in FLAG_PATTERNS]
+    def __init__(self, cache_results: bool = False) -> None:
+        """Initialize the extractor.
+        
+        Args:
+            cache_results: Reuse results for files unchanged since they
+                were last extracted in this process
+        """
+        self._patterns = _COMPILED_PATTERNS
+        self._cache_results = cache_results
         self._tree_sitter_available = False
         self._parser: Any = None
         
-        # Try to initialize tree-sitter
+        # Try to initialize tree-sitter. The grammar is shared; each
+        # extractor gets its own parser, as parsers are not thread-safe.
         try:
-            import tree_sitter_python as ts_python
-            from tree_sitter import Language, Parser
+            from tree_sitter import Parser
             
-            PY_LANGUAGE = Language(ts_python.language())
-            self._parser = Parser(PY_LANGUAGE)
+            self._parser = Parser(_python_language())
             self._tree_sitter_available = True
             logger.debug("tree-sitter Python parser initialized")
         except ImportError:
@@ -63,15 +148,39 @@ class PythonFlagExtractor:
             List of FlagUsage objects found
         """
         try:
-            content = file_path.read_text(encoding="utf-8")
+            stat = file_path.stat()
+            # Empty files (e.g. package __init__.py) are never opened
+            if not stat.st_size:
+                return []
+            key = (str(file_path), stat.st_mtime_ns, stat.st_size, self._tree_sitter_available)
+            if self._cache_results and key in _EXTRACT_CACHE:
+                # Copies, so callers cannot alter what later scans return
+                return [replace(u) for u in _EXTRACT_CACHE[key]]
+            # Most files never mention a flag; skip decoding and parsing them
+            data = _read_if_relevant(file_path, stat.st_size)
+            content = None
+            if data is not None:
+                content = data.decode("utf-8")
+                if "\r" in content:
+                    # Match read_text()'s universal newline handling
+                    content = content.replace("\r\n", "\n").replace("\r", "\n")
+                    data = None
         except Exception as e:
             logger.error(f"Failed to read {file_path}: {e}")
             return []
         
-        if self._tree_sitter_available:
-            return self._extract_with_tree_sitter(file_path, content)
+        if content is None:
+            usages = []
+        elif self._tree_sitter_available:
+            usages = self._extract_with_tree_sitter(file_path, content, data)
         else:
-            return self._extract_with_regex(file_path, content)
+            usages = self._extract_with_regex(file_path, content)
+        
+        if self._cache_results:
+            if len(_EXTRACT_CACHE) >= _EXTRACT_CACHE_MAX_ENTRIES:
+                del _EXTRACT_CACHE[next(iter(_EXTRACT_CACHE))]
+            _EXTRACT_CACHE[key] = [replace(u) for u in usages]
+        return usages
     
     def _extract_with_regex(
         self,
@@ -81,18 +190,19 @@ class PythonFlagExtractor:
         """Extract flags using regex patterns."""
         usages: list[FlagUsage] = []
         lines = content.splitlines()
+        function_index = self._build_function_index(lines)
         
         for line_num, line in enumerate(lines, start=1):
             for pattern in self._patterns:
                 for match in pattern.finditer(line):
-                    flag_name = match.group(1)
+                    flag_name = sys.intern(match.group(1))
                     
                     # Check if negated
                     negated = self._is_negated(line, match.start())
                     
                     # Try to determine containing function
                     containing_func = self._find_containing_function(
-                        lines, line_num - 1
+                        function_index, line_num - 1
                     )
                     
                     usages.append(FlagUsage(
@@ -112,19 +222,26 @@ class PythonFlagExtractor:
         self,
         file_path: Path,
         content: str,
+        source: bytes | None = None,
     ) -> list[FlagUsage]:
-        """Extract flags using tree-sitter AST parsing."""
+        """Extract flags using tree-sitter AST parsing.
+        
+        source, when given, is content's UTF-8 encoding as read from disk;
+        it is parsed directly instead of re-encoding content.
+        """
         if not self._parser:
             return self._extract_with_regex(file_path, content)
         
-        tree = self._parser.parse(bytes(content, "utf-8"))
+        if source is None:
+            source = bytes(content, "utf-8")
+        tree = self._parser.parse(source)
         usages: list[FlagUsage] = []
         
         # Query for function calls
         self._traverse_tree(
             tree.root_node,
             file_path,
-            content,
+            content.splitlines(),
             usages,
         )
         
@@ -134,56 +251,74 @@ class PythonFlagExtractor:
         self,
         node: Any,
         file_path: Path,
-        content: str,
+        lines: list[str],
         usages: list[FlagUsage],
-        context: dict[str, str | None] | None = None,
+        function: str | None = None,
+        class_name: str | None = None,
+        negated: bool = False,
+        check_type: str = "expression",
     ) -> None:
-        """Traverse AST and extract flag usages."""
-        if context is None:
-            context = {"function": None, "class": None}
+        """Traverse AST and extract flag usages.
         
-        # Update context for function/class definitions
-        if node.type == "function_definition":
+        Enclosing context (function, class, negation, check type) is
+        carried down the recursion rather than recovered by walking back
+        up the parents of every call.
+        """
+        node_type = node.type
+        
+        # Update context for definitions and enclosing constructs
+        if node_type == "function_definition":
             name_node = node.child_by_field_name("name")
             if name_node:
-                context = {**context, "function": name_node.text.decode("utf-8")}
-        elif node.type == "class_definition":
+                function = name_node.text.decode("utf-8")
+        elif node_type == "class_definition":
             name_node = node.child_by_field_name("name")
             if name_node:
-                context = {**context, "class": name_node.text.decode("utf-8")}
-        
-        # Check for function calls
-        if node.type == "call":
-            usage = self._extract_from_call(node, file_path, content, context)
+                class_name = name_node.text.decode("utf-8")
+        elif node_type == "not_operator":
+            negated = True
+        elif node_type in _CHECK_TYPES:
+            check_type = _CHECK_TYPES[node_type]
+        elif node_type == "call":
+            usage = self._extract_from_call(
+                node, file_path, lines, function, class_name, negated, check_type
+            )
             if usage:
                 usages.append(usage)
         
         # Recurse into children
         for child in node.children:
-            self._traverse_tree(child, file_path, content, usages, context)
+            if child.child_count:
+                self._traverse_tree(
+                    child, file_path, lines, usages,
+                    function, class_name, negated, check_type,
+                )
     
     def _extract_from_call(
         self,
         node: Any,
         file_path: Path,
-        content: str,
-        context: dict[str, str | None],
+        lines: list[str],
+        function: str | None,
+        class_name: str | None,
+        negated: bool,
+        check_type: str,
     ) -> FlagUsage | None:
         """Extract flag usage from a function call node."""
         func_node = node.child_by_field_name("function")
         if not func_node:
             return None
         
-        func_text = func_node.text.decode("utf-8")
-        
-        # Check if this is a flag-checking function
-        flag_funcs = [
-            "is_enabled", "is_feature_enabled", "feature_enabled",
-            "variation", "get_flag", "has_feature", "check_feature",
-        ]
-        
-        func_name = func_text.split(".")[-1]  # Handle method calls
-        if func_name not in flag_funcs:
+        # Check if this is a flag-checking function (or method). For
+        # attribute calls only the method name is decoded, not the chain.
+        if func_node.type == "attribute":
+            attr_node = func_node.child_by_field_name("attribute")
+            if not attr_node:
+                return None
+            func_name = attr_node.text.decode("utf-8")
+        else:
+            func_name = func_node.text.decode("utf-8").rsplit(".", 1)[-1]
+        if func_name not in _FLAG_FUNCS:
             return None
         
         # Get the first argument (flag name)
@@ -194,15 +329,12 @@ class PythonFlagExtractor:
         # Find string argument
         for child in args_node.children:
             if child.type == "string":
-                flag_name = child.text.decode("utf-8").strip("'\"")
+                # Interned, as the same few names recur across many files
+                flag_name = sys.intern(child.text.decode("utf-8").strip("'\""))
                 
                 # Get line content
-                lines = content.splitlines()
                 line_content = lines[node.start_point[0]] if lines else ""
                 
-                # Check for negation
-                negated = self._check_negation_in_ast(node)
-                
                 return FlagUsage(
                     flag_name=flag_name,
                     file_path=str(file_path),
@@ -210,9 +342,9 @@ class PythonFlagExtractor:
                     column=node.start_point[1],
                     end_line=node.end_point[0] + 1,
                     end_column=node.end_point[1],
-                    containing_function=context.get("function"),
-                    containing_class=context.get("class"),
-                    check_type=self._determine_check_type(node),
+                    containing_function=function,
+                    containing_class=class_name,
+                    check_type=check_type,
                     negated=negated,
                     code_snippet=line_content.strip(),
                 )
@@ -224,45 +356,37 @@ class PythonFlagExtractor:
         prefix = line[:match_start].rstrip()
         return prefix.endswith("not ") or prefix.endswith("!")
     
-    def _check_negation_in_ast(self, node: Any) -> bool:
-        """Check if node is inside a not expression."""
-        parent = node.parent
-        while parent:
-            if parent.type == "not_operator":
-                return True
-            parent = parent.parent
-        return False
-    
-    def _determine_check_type(self, node: Any) -> str:
-        """Determine the type of flag check."""
-        parent = node.parent
-        while parent:
-            if parent.type == "if_statement":
-                return "if"
-            elif parent.type == "conditional_expression":
-                return "ternary"
-            elif parent.type == "assignment":
-                return "assignment"
-            elif parent.type == "match_statement":
-                return "match"
-            parent = parent.parent
-        return "expression"
+    def _build_function_index(
+        self,
+        lines: list[str],
+    ) -> tuple[list[int], list[str | None]]:
+        """Index the ``def``/``class`` lines of a file in a single pass.
+        
+        Returns parallel lists of line indices and function names, where a
+        ``None`` name marks a class boundary.
+        """
+        line_indices: list[int] = []
+        names: list[str | None] = []
+        for i, line in enumerate(lines):
+            line = line.lstrip()
+            if line.startswith("def "):
+                match = _DEF_PATTERN.match(line)
+                if match:
+                    line_indices.append(i)
+                    names.append(match.group(1))
+            elif line.startswith("class "):
+                line_indices.append(i)
+                names.append(None)
+        return line_indices, names
     
     def _find_containing_function(
         self,
-        lines: list[str],
+        function_index: tuple[list[int], list[str | None]],
         current_line: int,
     ) -> str | None:
         """Find the function containing the current line."""
-        # Simple heuristic: look backwards for 'def '
-        for i in range(current_line, -1, -1):
-            line = lines[i].lstrip()
-            if line.startswith("def "):
-                # Extract function name
-                match = re.match(r"def\s+(\w+)\s*\(", line)
-                if match:
-                    return match.group(1)
-            elif line.startswith("class "):
-                # We've gone past the function into class level
-                break
-        return None
+        # Simple heuristic: nearest preceding 'def ', unless a 'class '
+        # line sits between it and the current line
+        line_indices, names = function_index
+        pos = bisect_right(line_indices, current_line)
+        return names[pos - 1] if pos else None
@@ -4,7 +4,9 @@ This module provides the SourceScanner class that orchestrates
 scanning directories for feature flag usage across multiple languages.
 """
 
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Callable
 
@@ -13,6 +15,28 @@ from flagguard.core.logging import get_logger
 
 logger = get_logger("scanner")
 
+# Per-process scanner used by pool workers, set up by _init_worker
+_worker_scanner: "SourceScanner | None" = None
+
+
+def _init_worker(scanner_cls: type["SourceScanner"], exclude_patterns: set[str]) -> None:
+    """Build a worker's scanner with the same class and settings as the parent."""
+    global _worker_scanner
+    _worker_scanner = scanner_cls(exclude_patterns=exclude_patterns, max_workers=1)
+
+
+def _scan_one(path_str: str) -> tuple[list[FlagUsage], str | None]:
+    """Scan one file in a worker process.
+    
+    Returns the usages found and an error message if scanning failed.
+    """
+    assert _worker_scanner is not None
+    file_path = Path(path_str)
+    try:
+        return _worker_scanner._scan_file(file_path), None
+    except Exception as e:
+        return [], f"{file_path}: {e}"
+
 
 class SourceScanner:
     """Scans source code directories for feature flag usage.
@@ -37,18 +61,26 @@ class SourceScanner:
         ".pytest_cache",
     }
     
+    # Below this many files, worker startup costs more than it saves
+    PARALLEL_MIN_FILES = 200
+    
     def __init__(
         self,
         exclude_patterns: set[str] | None = None,
+        max_workers: int | None = 1,
     ) -> None:
         """Initialize the scanner.
         
         Args:
             exclude_patterns: Additional directory names to exclude
+            max_workers: Worker processes for large scans. The default of 1
+                scans serially, which is safe inside server processes;
+                None uses the CPU count.
         """
         self.exclude_patterns = self.DEFAULT_EXCLUDES.copy()
         if exclude_patterns:
             self.exclude_patterns.update(exclude_patterns)
+        self.max_workers = max_workers
         
         self._extractors: dict[str, Callable[[Path], list[FlagUsage]]] = {}
         self._setup_extractors()
@@ -93,17 +125,28 @@ class SourceScanner:
         errors: list[str] = []
         files_scanned = 0
         
-        for file_path in self._iter_files(root):
-            if max_files and files_scanned >= max_files:
-                break
-            
-            try:
-                file_usages = self._scan_file(file_path)
-                usages.extend(file_usages)
-                files_scanned += 1
-            except Exception as e:
-                errors.append(f"{file_path}: {e}")
-                logger.debug(f"Error scanning {file_path}: {e}")
+        files = self._iter_files(root)
+        workers = self.max_workers or os.cpu_count() or 1
+        if not max_files and workers > 1 and len(files) >= self.PARALLEL_MIN_FILES:
+            for file_usages, error in self._scan_parallel(files, workers):
+                if error:
+                    errors.append(error)
+                    logger.debug(f"Error scanning {error}")
+                else:
+                    usages.extend(file_usages)
+                    files_scanned += 1
+        else:
+            for file_path in files:
+                if max_files and files_scanned >= max_files:
+                    break
+                
+                try:
+                    file_usages = self._scan_file(file_path)
+                    usages.extend(file_usages)
+                    files_scanned += 1
+                except Exception as e:
+                    errors.append(f"{file_path}: {e}")
+                    logger.debug(f"Error scanning {file_path}: {e}")
         
         scan_time = time.time() - start_time
         logger.info(f"Scanned {files_scanned} files in {scan_time:.2f}s")
@@ -115,23 +158,59 @@ class SourceScanner:
             errors=errors,
         )
     
+    def _scan_parallel(
+        self,
+        files: list[Path],
+        workers: int,
+    ) -> list[tuple[list[FlagUsage], str | None]]:
+        """Scan files across worker processes, preserving input order.
+        
+        Extraction is CPU bound, so separate processes sidestep the GIL.
+        """
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(type(self), self.exclude_patterns),
+        ) as executor:
+            return list(executor.map(
+                _scan_one, [str(path) for path in files], chunksize=16
+            ))
+    
     def _iter_files(self, root: Path) -> list[Path]:
-        """Iterate over scannable files in a directory."""
+        """Iterate over scannable files in a directory.
+        
+        Walks with os.scandir, whose entries carry their file type from the
+        directory listing, and never descends into excluded directories.
+        Files are returned in the same order as Path.rglob would give.
+        """
         files: list[Path] = []
+        self._walk(os.fspath(root), files)
+        return files
+    
+    def _walk(self, directory: str, files: list[Path]) -> None:
+        """Collect scannable files under directory, depth first."""
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            # Unreadable directories are skipped, as rglob does
+            return
         
-        for path in root.rglob("*"):
-            if not path.is_file():
-                continue
-            
-            # Check if in excluded directory
-            if any(exclude in path.parts for exclude in self.exclude_patterns):
+        excludes = self.exclude_patterns
+        extractors = self._extractors
+        subdirs: list[str] = []
+        for entry in entries:
+            name = entry.name
+            if name in excludes:
                 continue
-            
-            # Check if we have an extractor for this extension
-            if path.suffix in self._extractors:
-                files.append(path)
+            # Symlinked directories are not followed; symlinked files are
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif os.path.splitext(name)[1] in extractors and entry.is_file():
+                files.append(Path(entry.path))
         
-        return files
+        for subdir in subdirs:
+            self._walk(subdir, files)
     
     def _scan_file(self, file_path: Path) -> list[FlagUsage]:
         """Scan a single file for flag usages."""
@@ -9,6 +9,9 @@ from flagguard.parsers.base import BaseParser, ParserError
 
 ParserType = Literal["launchdarkly", "unleash", "generic", "auto"]
 
+# How much of a large file parse_config reads to auto-detect its format
+_DETECT_HEAD_BYTES = 64 * 1024
+
 
 def get_parser(parser_type: ParserType = "auto") -> BaseParser:
     """Get the appropriate parser for a given type.
@@ -66,8 +69,44 @@ def parse_config(
     if not path.exists():
         raise FileNotFoundError(f"Configuration file not found: {path}")
     
+    from flagguard.parsers.launchdarkly import STREAM_MIN_SIZE
+    
+    # Large LaunchDarkly exports go through parse_file, which can stream
+    # them. Auto-detection looks at the head only; a head that does not
+    # identify the format falls through to reading the whole file.
+    if parser_type in ("launchdarkly", "auto") and path.stat().st_size >= STREAM_MIN_SIZE:
+        if parser_type == "auto":
+            with open(path, "rb") as f:
+                head = f.read(_DETECT_HEAD_BYTES).decode("utf-8", errors="ignore")
+            detected = BaseParser.detect_format(head)
+        else:
+            detected = parser_type
+        if detected == "launchdarkly":
+            return get_parser("launchdarkly").parse_file(path)
+    
     content = path.read_text(encoding="utf-8")
+    return parse_config_text(content, parser_type)
+
+
+def parse_config_text(
+    content: str,
+    parser_type: ParserType = "auto",
+) -> list[FlagDefinition]:
+    """Parse configuration content that has already been read.
     
+    Use this instead of parse_config when the caller also needs the raw
+    content, so the file is only read once.
+    
+    Args:
+        content: Raw configuration content
+        parser_type: Type of parser to use ("auto" for auto-detection)
+        
+    Returns:
+        List of FlagDefinition objects
+        
+    Raises:
+        ParserError: If parsing fails
+    """
     if parser_type == "auto":
         # Detect format from content
         detected_format = BaseParser.detect_format(content)
@@ -10,6 +10,13 @@ from flagguard.core.models import (
 )
 from flagguard.parsers.base import BaseParser, ParserError
 
+# orjson is an optional, faster drop-in for json.loads
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class GenericParser(BaseParser):
     """Parser for generic JSON configuration format.
@@ -40,8 +47,11 @@ class GenericParser(BaseParser):
             ParserError: If parsing fails
         """
         try:
-            data = json.loads(content)
-        except json.JSONDecodeError as e:
+            if ORJSON_AVAILABLE:
+                data = orjson.loads(content)
+            else:
+                data = json.loads(content)
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses this
             raise ParserError(f"Invalid JSON: {e}") from e
         
         # Handle both array and object formats
@@ -1,6 +1,8 @@
 """LaunchDarkly configuration parser."""
 
 import json
+import sys
+from pathlib import Path
 from typing import Any
 
 from flagguard.core.models import (
@@ -11,6 +13,56 @@ from flagguard.core.models import (
 )
 from flagguard.parsers.base import BaseParser, ParserError
 
+# orjson is an optional, faster drop-in for json.loads
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# ijson is optional; it lets large exports be parsed one flag at a time
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Exports at least this large are streamed by parse_file when ijson is
+# installed, rather than decoded into one document
+STREAM_MIN_SIZE = 4 * 1024 * 1024
+
+# Flag type by the Python type of the first variation value
+_VARIATION_TYPES: dict[type, FlagType] = {
+    bool: FlagType.BOOLEAN,
+    str: FlagType.STRING,
+    int: FlagType.NUMBER,
+    float: FlagType.NUMBER,
+}
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings that recur across flags (names, keys, tags).
+    
+    Flag names are looked up again via dependency keys during analysis,
+    so sharing one object lets those dict probes compare by identity.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+def _require_flags_object(events: Any) -> Any:
+    """Pass ijson parse events through, rejecting a non-object 'flags' value.
+    
+    kvitems() silently yields nothing for an array or scalar, where
+    LaunchDarklyParser.parse() raises; this keeps the two consistent.
+    """
+    checked = False
+    for prefix, event, value in events:
+        if not checked and prefix == "flags":
+            if event != "start_map":
+                raise ParserError("Expected 'flags' to be an object")
+            checked = True
+        yield prefix, event, value
+
 
 class LaunchDarklyParser(BaseParser):
     """Parser for LaunchDarkly JSON export format.
@@ -32,8 +84,11 @@ class LaunchDarklyParser(BaseParser):
             ParserError: If parsing fails
         """
         try:
-            data = json.loads(content)
-        except json.JSONDecodeError as e:
+            if ORJSON_AVAILABLE:
+                data = orjson.loads(content)
+            else:
+                data = json.loads(content)
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses this
             raise ParserError(f"Invalid JSON: {e}") from e
         
         flags_data = data.get("flags", {})
@@ -48,10 +103,52 @@ class LaunchDarklyParser(BaseParser):
         
         return flags
     
+    def parse_file(self, path: Path) -> list[FlagDefinition]:
+        """Parse a LaunchDarkly export file.
+        
+        Large exports are streamed when ijson is available, so peak memory
+        is one flag rather than the whole document.
+        
+        Args:
+            path: Path to the export file
+            
+        Returns:
+            List of FlagDefinition objects
+        """
+        if IJSON_AVAILABLE and path.stat().st_size >= STREAM_MIN_SIZE:
+            return self.parse_stream(path)
+        return super().parse_file(path)
+    
+    def parse_stream(self, path: Path) -> list[FlagDefinition]:
+        """Parse a LaunchDarkly export incrementally with ijson.
+        
+        Args:
+            path: Path to the export file
+            
+        Returns:
+            List of FlagDefinition objects
+            
+        Raises:
+            ParserError: If parsing fails or ijson is not installed
+        """
+        if not IJSON_AVAILABLE:
+            raise ParserError("Streaming requires ijson: pip install ijson")
+        
+        flags: list[FlagDefinition] = []
+        try:
+            with open(path, "rb") as f:
+                events = _require_flags_object(ijson.parse(f, use_float=True))
+                for flag_key, flag_data in ijson.kvitems(events, "flags"):
+                    flags.append(self._parse_flag(flag_key, flag_data))
+        except ijson.JSONError as e:
+            raise ParserError(f"Invalid JSON: {e}") from e
+        
+        return flags
+    
     def _parse_flag(self, key: str, data: dict[str, Any]) -> FlagDefinition:
         """Parse a single flag definition."""
         # Get flag name (prefer 'key' if present, fall back to object key)
-        name = data.get("key", key)
+        name = _intern(data.get("key", key))
         
         # Determine flag type from variations
         variations_raw = data.get("variations", [True, False])
@@ -62,7 +159,7 @@ class LaunchDarklyParser(BaseParser):
         
         # Parse prerequisites as dependencies
         prerequisites = data.get("prerequisites", [])
-        dependencies = [p["key"] for p in prerequisites if "key" in p]
+        dependencies = [_intern(p["key"]) for p in prerequisites if "key" in p]
         
         # Parse targeting rules
         rules = data.get("rules", [])
@@ -89,7 +186,7 @@ class LaunchDarklyParser(BaseParser):
             targeting_rules=targeting_rules,
             dependencies=dependencies,
             description=data.get("description", ""),
-            tags=data.get("tags", []),
+            tags=[_intern(t) for t in data.get("tags") or []],
         )
     
     def _detect_type(self, variations: list[Any]) -> FlagType:
@@ -97,29 +194,20 @@ class LaunchDarklyParser(BaseParser):
         if not variations:
             return FlagType.BOOLEAN
         
-        first = variations[0]
-        if isinstance(first, bool):
-            return FlagType.BOOLEAN
-        elif isinstance(first, str):
-            return FlagType.STRING
-        elif isinstance(first, (int, float)):
-            return FlagType.NUMBER
-        else:
-            return FlagType.JSON
+        # Exact type match: JSON decoding only yields these builtins, and it
+        # keeps bool from being treated as its int superclass
+        return _VARIATION_TYPES.get(type(variations[0]), FlagType.JSON)
     
     def _parse_variations(self, variations: list[Any]) -> list[FlagVariation]:
         """Parse variations into FlagVariation objects."""
-        result: list[FlagVariation] = []
-        
-        for i, value in enumerate(variations):
-            if isinstance(value, bool):
-                name = "on" if value else "off"
-            else:
-                name = f"variation_{i}"
-            
-            result.append(FlagVariation(name=name, value=value))
-        
-        return result
+        # Boolean values are named on/off, everything else by position
+        return [
+            FlagVariation(
+                name=("on" if value else "off") if isinstance(value, bool) else sys.intern(f"variation_{i}"),
+                value=value,
+            )
+            for i, value in enumerate(variations)
+        ]
     
     def _parse_rules(self, rules: list[dict[str, Any]]) -> list[TargetingRule]:
         """Parse targeting rules."""
@@ -128,8 +216,7 @@ class LaunchDarklyParser(BaseParser):
         for i, rule in enumerate(rules):
             conditions = rule.get("clauses", [])
             variation_idx = rule.get("variation", 0)
-            rollout = rule.get("rollout", {})
-            percentage = rollout.get("variations", [{}])[0].get("weight", 100000) / 1000
+            percentage = self._rollout_percentage(rule)
             
             result.append(TargetingRule(
                 name=rule.get("id", f"rule_{i}"),
@@ -139,3 +226,17 @@ class LaunchDarklyParser(BaseParser):
             ))
         
         return result
+    
+    def _rollout_percentage(self, rule: dict[str, Any]) -> float:
+        """Get the rollout percentage of a rule's first variation.
+        
+        LaunchDarkly weights are in thousandths of a percent; rules
+        without a rollout serve 100%.
+        """
+        weight = 100000
+        rollout = rule.get("rollout")
+        if rollout:
+            variations = rollout.get("variations")
+            if variations:
+                weight = variations[0].get("weight", 100000)
+        return weight / 1000
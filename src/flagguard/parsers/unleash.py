@@ -3,8 +3,6 @@
 import json
 from typing import Any
 
-import yaml
-
 from flagguard.core.models import (
     FlagDefinition,
     FlagType,
@@ -13,6 +11,13 @@ from flagguard.core.models import (
 )
 from flagguard.parsers.base import BaseParser, ParserError
 
+# orjson is an optional, faster drop-in for json.loads
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class UnleashParser(BaseParser):
     """Parser for Unleash YAML/JSON configuration format.
@@ -33,14 +38,18 @@ class UnleashParser(BaseParser):
         Raises:
             ParserError: If parsing fails
         """
-        # Try YAML first (also handles JSON as valid YAML)
-        try:
-            data = yaml.safe_load(content)
-        except yaml.YAMLError as e:
-            # Fall back to JSON
+        data = self._load_json(content)
+        if data is None:
+            # Not JSON - go through YAML. Any JSON document that could
+            # still decode was already tried above, so a YAML error here
+            # is final. yaml is imported here, off the startup path for
+            # JSON-only users; the libyaml-backed loader is used if built.
+            import yaml
+            
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
             try:
-                data = json.loads(content)
-            except json.JSONDecodeError:
+                data = yaml.load(content, Loader=loader)
+            except yaml.YAMLError as e:
                 raise ParserError(f"Failed to parse as YAML or JSON: {e}") from e
         
         if data is None:
@@ -58,6 +67,22 @@ class UnleashParser(BaseParser):
         
         return flags
     
+    def _load_json(self, content: str) -> Any:
+        """Decode content directly as JSON when it looks like JSON.
+        
+        Skips the much slower YAML loader for the common JSON case.
+        Returns None if the content isn't JSON, leaving it to YAML.
+        """
+        if content.lstrip()[:1] not in ("{", "["):
+            return None
+        try:
+            if ORJSON_AVAILABLE:
+                return orjson.loads(content)
+            return json.loads(content)
+        except json.JSONDecodeError:
+            # Could still be a YAML flow mapping like "{features: []}"
+            return None
+    
     def _parse_feature(self, data: dict[str, Any]) -> FlagDefinition:
         """Parse a single feature toggle definition."""
         name = data.get("name", "")
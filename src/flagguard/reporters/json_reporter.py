@@ -1,11 +1,25 @@
 """JSON report generator for CI/CD integration."""
 
 import json
+from collections import Counter
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
-from flagguard.core.models import Conflict, DeadCodeBlock, FlagDefinition
+from flagguard.core.models import (
+    Conflict,
+    ConflictSeverity,
+    DeadCodeBlock,
+    FlagDefinition,
+)
+
+# orjson is an optional, faster drop-in for json.dumps
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 class JSONReporter:
@@ -33,6 +47,31 @@ class JSONReporter:
         Returns:
             Dictionary containing the analysis report
         """
+        # Walk each input list once, serializing items and gathering the
+        # counts for the summary and statistics in the same pass
+        flag_dicts: list[dict[str, Any]] = []
+        type_counts: dict[str, int] = {}
+        enabled_count = 0
+        with_dependencies = 0
+        for f in flags:
+            flag_dict = f.to_dict()
+            flag_dicts.append(flag_dict)
+            type_value = flag_dict["type"]
+            type_counts[type_value] = type_counts.get(type_value, 0) + 1
+            if f.enabled:
+                enabled_count += 1
+            if f.dependencies:
+                with_dependencies += 1
+        
+        dead_dicts: list[dict[str, Any]] = []
+        total_dead_lines = 0
+        dead_files: set[str] = set()
+        for block in dead_blocks:
+            block_dict = block.to_dict()
+            dead_dicts.append(block_dict)
+            total_dead_lines += block_dict["estimated_lines"]
+            dead_files.add(block.file_path)
+        
         return {
             "version": "1.0",
             "generated_at": datetime.now().isoformat(),
@@ -40,43 +79,49 @@ class JSONReporter:
                 "total_flags": len(flags),
                 "total_conflicts": len(conflicts),
                 "total_dead_code_blocks": len(dead_blocks),
-                "total_dead_lines": sum(b.estimated_lines for b in dead_blocks),
+                "total_dead_lines": total_dead_lines,
                 "status": "pass" if len(conflicts) == 0 else "fail",
                 "executive_summary": executive_summary,
             },
-            "flags": [f.to_dict() for f in flags],
+            "flags": flag_dicts,
             "conflicts": [c.to_dict() for c in conflicts],
-            "dead_code": [d.to_dict() for d in dead_blocks],
-            "statistics": self._generate_statistics(flags, conflicts, dead_blocks),
+            "dead_code": dead_dicts,
+            "statistics": self._generate_statistics(
+                conflicts,
+                type_counts=type_counts,
+                enabled_count=enabled_count,
+                disabled_count=len(flags) - enabled_count,
+                with_dependencies=with_dependencies,
+                dead_code_files=len(dead_files),
+            ),
         }
     
     def _generate_statistics(
         self,
-        flags: list[FlagDefinition],
         conflicts: list[Conflict],
-        dead_blocks: list[DeadCodeBlock],
+        type_counts: dict[str, int],
+        enabled_count: int,
+        disabled_count: int,
+        with_dependencies: int,
+        dead_code_files: int,
     ) -> dict[str, Any]:
-        """Generate analysis statistics."""
-        # Conflict severity breakdown
-        severity_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-        for c in conflicts:
-            severity_counts[c.severity.value] += 1
+        """Generate analysis statistics.
         
-        # Flag type breakdown
-        type_counts: dict[str, int] = {}
-        for f in flags:
-            type_counts[f.flag_type.value] = type_counts.get(f.flag_type.value, 0) + 1
-        
-        # Enabled/disabled counts
-        enabled_count = sum(1 for f in flags if f.enabled)
+        Flag and dead code counts are gathered by generate_report while
+        serializing, so only conflicts are scanned here.
+        """
+        # Conflict severity breakdown, counted per enum member in C and
+        # mapped to string keys once per severity level
+        by_severity = Counter(map(attrgetter("severity"), conflicts))
+        severity_counts = {s.value: by_severity[s] for s in ConflictSeverity}
         
         return {
             "conflict_severity": severity_counts,
             "flag_types": type_counts,
             "enabled_flags": enabled_count,
-            "disabled_flags": len(flags) - enabled_count,
-            "flags_with_dependencies": sum(1 for f in flags if f.dependencies),
-            "dead_code_files": len(set(b.file_path for b in dead_blocks)),
+            "disabled_flags": disabled_count,
+            "flags_with_dependencies": with_dependencies,
+            "dead_code_files": dead_code_files,
         }
     
     def save(self, report: dict[str, Any], path: Path) -> None:
@@ -86,10 +131,25 @@ class JSONReporter:
             report: Report dictionary
             path: Output file path
         """
-        path.write_text(
-            json.dumps(report, indent=2, default=str),
-            encoding="utf-8",
-        )
+        path.write_bytes(self.to_bytes(report))
+    
+    def to_bytes(self, report: dict[str, Any], pretty: bool = True) -> bytes:
+        """Convert report to UTF-8 encoded JSON.
+        
+        Preferred over to_string when the result is written to a file or
+        stream, as it skips the intermediate str.
+        
+        Args:
+            report: Report dictionary
+            pretty: Whether to format with indentation
+            
+        Returns:
+            JSON bytes
+        """
+        if ORJSON_AVAILABLE:
+            option = orjson.OPT_INDENT_2 if pretty else None
+            return orjson.dumps(report, default=str, option=option)
+        return self._dumps(report, pretty).encode("utf-8")
     
     def to_string(self, report: dict[str, Any], pretty: bool = True) -> str:
         """Convert report to JSON string.
@@ -101,6 +161,12 @@ class JSONReporter:
         Returns:
             JSON string
         """
+        if ORJSON_AVAILABLE:
+            return self.to_bytes(report, pretty).decode("utf-8")
+        return self._dumps(report, pretty)
+    
+    def _dumps(self, report: dict[str, Any], pretty: bool) -> str:
+        """Serialize with the stdlib json module."""
         if pretty:
             return json.dumps(report, indent=2, default=str)
         return json.dumps(report, default=str)
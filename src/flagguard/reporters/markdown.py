@@ -5,6 +5,36 @@ from pathlib import Path
 
 from flagguard.core.models import Conflict, ConflictType, DeadCodeBlock, FlagDefinition
 
+# Icon lookups used while rendering, indexed by severity value / enabled state
+_SEVERITY_ICON = {
+    "critical": "🔴",
+    "high": "🟠",
+    "medium": "🟡",
+    "low": "🟢",
+}
+_STATUS_ICON = ("❌", "✅")
+
+# Escape tables for text placed in Markdown table cells. Pipes would split
+# the cell; backticks would open a code span. Inside a code span only the
+# pipe needs escaping, as GFM strips the backslash before rendering.
+_MD_TRANS = str.maketrans({"|": "\\|", "`": "\\`"})
+_MD_CODE_TRANS = str.maketrans({"|": "\\|"})
+
+
+def _code_list(names: list[str], sep: str = ", ") -> str:
+    """Render names as backticked code spans joined by sep.
+    
+    Joins once with the separator wrapped in backticks rather than
+    formatting each name separately.
+    """
+    if not names:
+        return ""
+    return "`" + f"`{sep}`".join(names) + "`"
+
+
+# Above this many flags the inventory table is replaced by a one-line note
+MAX_INLINE_FLAGS = 1000
+
 
 class MarkdownReporter:
     """Generates Markdown reports from analysis results.
@@ -16,9 +46,16 @@ class MarkdownReporter:
     - Dependency graph
     """
     
-    def __init__(self) -> None:
-        """Initialize the reporter."""
-        self._sections: list[str] = []
+    def __init__(self, max_inline_flags: int = MAX_INLINE_FLAGS) -> None:
+        """Initialize the reporter.
+        
+        Args:
+            max_inline_flags: Largest flag count rendered as a full
+                inventory table
+        """
+        self.max_inline_flags = max_inline_flags
+        # Report fragments, joined once at the end of generate_report
+        self._buf: list[str] = []
     
     def generate_report(
         self,
@@ -40,7 +77,7 @@ class MarkdownReporter:
         Returns:
             Complete Markdown report
         """
-        self._sections.clear()
+        self._buf.clear()
         
         # Split conflicts by type
         mutual_exclusions = [c for c in conflicts if c.conflict_type == ConflictType.MUTUAL_EXCLUSION]
@@ -72,7 +109,7 @@ class MarkdownReporter:
         # FLAG list
         self._add_flags_section(flags)
         
-        return "\n\n".join(self._sections)
+        return "".join(self._buf)
     
     def _add_header(
         self,
@@ -85,7 +122,7 @@ class MarkdownReporter:
         total_issues = conflict_count + dependency_count + dead_count
         status = "✅ Healthy" if total_issues == 0 else "⚠️ Issues Found"
         
-        header = f"""# FlagGuard Analysis Report
+        self._buf.append(f"""# FlagGuard Analysis Report
 
 **Generated:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}  
 **Status:** {status}
@@ -95,13 +132,16 @@ class MarkdownReporter:
 | Flags Analyzed | {flag_count} |
 | Mutual Conflicts | {conflict_count} |
 | Dependency Errors | {dependency_count} |
-| Dead Code Blocks | {dead_count} |"""
-        
-        self._sections.append(header)
+| Dead Code Blocks | {dead_count} |""")
+    
+    def _start_section(self, title: str) -> None:
+        """Append a section heading, separated from the previous section."""
+        self._buf.append(f"\n\n## {title}\n\n")
     
     def _add_section(self, title: str, content: str) -> None:
         """Add a section to the report."""
-        self._sections.append(f"## {title}\n\n{content}")
+        self._start_section(title)
+        self._buf.append(content)
     
     def _add_conflicts_section(self, conflicts: list[Conflict]) -> None:
         """Add mutual exclusion conflicts section."""
@@ -109,38 +149,33 @@ class MarkdownReporter:
             self._add_section("Mutual Exclusions", "✅ No mutual exclusion conflicts detected.")
             return
         
-        content_parts = []
+        self._start_section("Mutual Exclusions")
+        append = self._buf.append
         
-        for conflict in conflicts:
-            severity_icon = {
-                "critical": "🔴",
-                "high": "🟠",
-                "medium": "🟡",
-                "low": "🟢",
-            }.get(conflict.severity.value, "⚪")
+        for i, conflict in enumerate(conflicts):
+            if i:
+                append("\n---\n")
             
-            flags_str = ", ".join(f"`{f}`" for f in conflict.flags_involved)
+            severity_icon = _SEVERITY_ICON.get(conflict.severity.value, "⚪")
+            
+            flags_str = _code_list(conflict.flags_involved)
             values_str = ", ".join(
                 f"`{k}`={v}" for k, v in conflict.conflicting_values.items()
             )
             
-            part = f"""### {severity_icon} {conflict.conflict_id}: {flags_str}
+            append(f"""### {severity_icon} {conflict.conflict_id}: {flags_str}
 
 **Severity:** {conflict.severity.value.upper()}  
 **Conflicting State:** {values_str}
 
 **Reason:** {conflict.reason}
-"""
+""")
             if conflict.llm_explanation:
-                part += f"\n**Explanation:** {conflict.llm_explanation}\n"
+                append(f"\n**Explanation:** {conflict.llm_explanation}\n")
             
             if conflict.affected_code_locations:
                 locations = ", ".join(conflict.affected_code_locations[:5])
-                part += f"\n**Affected Locations:** {locations}\n"
-            
-            content_parts.append(part)
-        
-        self._add_section("Mutual Exclusions", "\n---\n".join(content_parts))
+                append(f"\n**Affected Locations:** {locations}\n")
 
     def _add_dependency_violations_section(self, violations: list[Conflict]) -> None:
         """Add dependency violations section."""
@@ -148,22 +183,22 @@ class MarkdownReporter:
             self._add_section("Dependency Violations", "✅ No dependency violations detected.")
             return
 
-        content_parts = []
+        self._start_section("Dependency Violations")
+        append = self._buf.append
 
-        for violation in violations:
-            flags_str = " → ".join(f"`{f}`" for f in violation.flags_involved)
+        for i, violation in enumerate(violations):
+            if i:
+                append("\n---\n")
+            
+            flags_str = _code_list(violation.flags_involved, " → ")
             
-            part = f"""### ⚠️ {violation.conflict_id}: {flags_str}
+            append(f"""### ⚠️ {violation.conflict_id}: {flags_str}
 
 **Type:** Dependency Violation  
 **Reason:** {violation.reason}
-"""
+""")
             if violation.llm_explanation:
-                part += f"\n**Explanation:** {violation.llm_explanation}\n"
-            
-            content_parts.append(part)
-        
-        self._add_section("Dependency Violations", "\n---\n".join(content_parts))
+                append(f"\n**Explanation:** {violation.llm_explanation}\n")
     
     def _add_dead_code_section(self, dead_blocks: list[DeadCodeBlock]) -> None:
         """Add dead code section."""
@@ -173,43 +208,52 @@ class MarkdownReporter:
         
         total_lines = sum(b.estimated_lines for b in dead_blocks)
         
-        content_parts = [f"**Total estimated dead lines:** {total_lines}\n"]
+        self._start_section("Dead Code")
+        append = self._buf.append
+        append(f"**Total estimated dead lines:** {total_lines}\n")
         
         for block in dead_blocks:
+            append("\n---\n")
+            
             flags_str = ", ".join(
                 f"`{k}`={v}" for k, v in block.required_flags.items()
             )
             
-            part = f"""### {block.file_path}:{block.start_line}-{block.end_line}
+            append(f"""### {block.file_path}:{block.start_line}-{block.end_line}
 
 **Required Flags:** {flags_str}  
 **Estimated Lines:** {block.estimated_lines}
 
 **Reason:** {block.reason}
-"""
+""")
             if block.code_snippet:
-                part += f"\n```\n{block.code_snippet[:200]}\n```\n"
-            
-            content_parts.append(part)
-        
-        self._add_section("Dead Code", "\n---\n".join(content_parts))
+                append(f"\n```\n{block.code_snippet[:200]}\n```\n")
     
     def _add_flags_section(self, flags: list[FlagDefinition]) -> None:
         """Add flags inventory section."""
         if not flags:
             return
         
-        rows = []
-        for flag in flags:
-            status = "✅" if flag.enabled else "❌"
-            deps = ", ".join(flag.dependencies) if flag.dependencies else "-"
-            rows.append(f"| `{flag.name}` | {status} | {flag.flag_type.value} | {deps} |")
+        # A table this large is unreadable and dominates render time
+        if len(flags) > self.max_inline_flags:
+            self._add_section(
+                "Flags Inventory",
+                f"**{len(flags)}** flags analyzed. The inventory table is omitted "
+                f"above {self.max_inline_flags} flags; use the JSON report "
+                f"(`--format json`) for the full list.",
+            )
+            return
         
-        content = """| Flag | Enabled | Type | Dependencies |
+        self._start_section("Flags Inventory")
+        self._buf.append("""| Flag | Enabled | Type | Dependencies |
 |------|---------|------|--------------|
-""" + "\n".join(rows)
-        
-        self._add_section("Flags Inventory", content)
+""")
+        self._buf.append("\n".join(
+            f"| `{flag.name.translate(_MD_CODE_TRANS)}` | "
+            f"{_STATUS_ICON[bool(flag.enabled)]} | {flag.flag_type.value} | "
+            f"{', '.join(flag.dependencies).translate(_MD_TRANS) if flag.dependencies else '-'} |"
+            for flag in flags
+        ))
     
     def save(self, content: str, path: Path) -> None:
         """Save report to file.
@@ -1,5 +1,12 @@
 """Web UI module for FlagGuard Gradio interface."""
 
-from flagguard.ui.app import create_app, launch
-
 __all__ = ["create_app", "launch"]
+
+
+def __getattr__(name: str):
+    # Import the app (and its dashboards) only when it is actually requested,
+    # so importing a submodule such as flagguard.ui.helpers stays cheap
+    if name in __all__:
+        from flagguard.ui import app
+        return getattr(app, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,8 +7,14 @@ Bug fix: Mermaid code with braces was breaking Python f-string HTML templates.
 import base64
 import hashlib
 import json
+import os
+import shutil
+import subprocess
+import tempfile
 import time as _time
+from collections import Counter, deque
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -18,16 +24,51 @@ try:
 except ImportError:
     PLOTLY_AVAILABLE = False
 
-import gradio as gr
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-HISTORY_FILE = Path.home() / ".flagguard" / "scan_history.json"
+import gradio as gr
 
-def create_charts(flags: list, conflicts: list):
-    """Generate Gold/Emerald/Silver palette charts."""
+from flagguard.analysis import ConflictDetector, ConflictType, FlagSATSolver
+from flagguard.parsers import parse_config, parse_config_text
+from flagguard.reporters import MarkdownReporter
+
+# Append-only, one JSON entry per line; oldest first
+HISTORY_FILE = Path.home() / ".flagguard" / "scan_history.jsonl"
+# Earlier releases kept a JSON array here, newest first
+_LEGACY_HISTORY_FILE = HISTORY_FILE.with_suffix(".json")
+HISTORY_LIMIT = 50
+_HISTORY_COMPACT_BYTES = 128 * 1024   # ~1000 entries before trimming
+
+# The report Markdown shown in the UI is cut off after this many lines;
+# Gradio re-parses the whole document on every render
+MAX_UI_REPORT_LINES = 2000
+
+# Above this many flags the graph only draws the first MAX_GRAPH_NODES
+# (enabled flags first); Mermaid's layout stalls on much larger diagrams
+MAX_GRAPH_NODES = 200
+
+# Severity bar order and colours
+_SEVERITY_BAR_COLORS = (
+    ('CRITICAL', '#dc2626'),
+    ('HIGH', '#d4af37'),
+    ('MEDIUM', '#f59e0b'),
+    ('LOW', '#30d158'),
+)
+
+def create_charts(flags: list, conflicts: list, enabled_count: Optional[int] = None):
+    """Generate Gold/Emerald/Silver palette charts.
+
+    Pass enabled_count when the caller has already counted enabled flags.
+    """
     if not PLOTLY_AVAILABLE:
         return None, None
 
-    enabled_count = sum(1 for f in flags if f.enabled)
+    if enabled_count is None:
+        enabled_count = sum(1 for f in flags if f.enabled)
     disabled_count = len(flags) - enabled_count
     total = len(flags)
 
@@ -49,19 +90,15 @@ def create_charts(flags: list, conflicts: list):
                        margin=dict(t=20, b=20, l=20, r=20), height=280,
                        font=dict(family="Outfit"))
 
-    # Severity bar
-    from flagguard.analysis import ConflictType
+    # Severity bar: count severity members first, then label each distinct one
+    by_severity = Counter(getattr(c, 'severity', None) for c in conflicts)
     severities = {}
-    for c in conflicts:
-        s = str(c.severity.value).upper() if hasattr(c, 'severity') else 'MEDIUM'
-        severities[s] = severities.get(s, 0) + 1
-    if not severities:
-        severities = {'NONE': 0}
-
-    order = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
-    counts = [severities.get(s, 0) for s in order]
-    colors = ['#dc2626', '#d4af37', '#f59e0b', '#30d158']
-    filtered_data = [(l, c, col) for l, c, col in zip(order, counts, colors) if c > 0]
+    for sev, n in by_severity.items():
+        s = str(sev.value).upper() if sev is not None else 'MEDIUM'
+        severities[s] = severities.get(s, 0) + n
+
+    filtered_data = [(label, severities[label], color)
+                     for label, color in _SEVERITY_BAR_COLORS if severities.get(label)]
     if not filtered_data:
         filtered_data = [('OPERATIONAL', 0, '#30d158')]
     f_labels, f_counts, f_colors = zip(*filtered_data)
@@ -82,46 +119,233 @@ def create_charts(flags: list, conflicts: list):
     )
     return fig1, fig2
 
-def generate_mermaid_html(flags: list, conflicts: list) -> tuple[str, str]:
+# Shared by the in-browser renderer and the mermaid-cli config file
+_MERMAID_CONFIG = {
+    "theme": "dark",
+    "themeVariables": {
+        "darkMode": True,
+        "background": "#0a1929",
+        "primaryColor": "#d4af37",
+        "primaryTextColor": "#000",
+        "primaryBorderColor": "#b8962f",
+        "lineColor": "#94a3b8",
+        "secondaryColor": "#1e3a5f",
+        "tertiaryColor": "#152940",
+    },
+    "flowchart": {"htmlLabels": True, "curve": "basis", "padding": 20},
+}
+_MMDC_TIMEOUT = 10  # seconds
+# Rendered SVGs survive restarts here, keyed by a hash of source + config.
+# The SVG is embedded in the page as-is, so only a private per-user
+# directory is trusted (see _mermaid_cache_dir).
+_MERMAID_SVG_CACHE_DIR = Path.home() / ".flagguard" / "cache" / "mermaid"
+
+
+def _mermaid_cache_dir() -> Optional[Path]:
+    """Return the SVG cache directory, or None if it cannot be trusted.
+
+    The directory is created private to the current user. An existing one
+    is only used if that user owns it and nobody else can write to it, so
+    other local users cannot plant SVGs that would be served as cached.
+    """
+    try:
+        _MERMAID_SVG_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = _MERMAID_SVG_CACHE_DIR.lstat()
+    except OSError:
+        return None
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o022):
+        return None
+    return _MERMAID_SVG_CACHE_DIR
+
+
+def _render_mermaid_svg(mermaid_code: str) -> Optional[str]:
+    """Render Mermaid source to SVG with mermaid-cli (mmdc) when installed.
+
+    Returns None when mmdc is unavailable or fails, in which case the graph
+    is rendered in the browser with mermaid.js from the CDN instead.
+    """
+    mmdc = shutil.which("mmdc")
+    if mmdc is None:
+        return None
+    config_json = json.dumps(_MERMAID_CONFIG)
+    key = hashlib.blake2b(f"{config_json}\n{mermaid_code}".encode("utf-8"), digest_size=16).hexdigest()
+    cache_dir = _mermaid_cache_dir()
+    cached = cache_dir / f"{key}.svg" if cache_dir else None
+    if cached is not None:
+        try:
+            return cached.read_text(encoding="utf-8")
+        except OSError:
+            pass
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_dir = Path(tmp)
+            (tmp_dir / "graph.mmd").write_text(mermaid_code, encoding="utf-8")
+            (tmp_dir / "config.json").write_text(config_json, encoding="utf-8")
+            subprocess.run(
+                [mmdc, "-i", "graph.mmd", "-o", "graph.svg",
+                 "-c", "config.json", "-b", "transparent"],
+                cwd=tmp_dir, capture_output=True, timeout=_MMDC_TIMEOUT, check=True,
+            )
+            svg = (tmp_dir / "graph.svg").read_text(encoding="utf-8")
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if cached is None:
+        return svg
+    try:
+        tmp_file = cached.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(svg, encoding="utf-8")
+        tmp_file.replace(cached)
+    except OSError:
+        pass  # caching is best-effort
+    return svg
+
+def generate_mermaid_html(
+    flags: list, conflicts: list, max_nodes: int = MAX_GRAPH_NODES
+) -> tuple[str, str]:
     """
     Generate dependency graph HTML with Mermaid.
     FIXED BUG: Mermaid code is injected as a JS string (json.dumps) to avoid
     Python f-string brace escaping issues that corrupted the previous HTML.
+    Graphs with more than max_nodes flags are trimmed (see _mermaid_lines).
+    With no flags there is nothing to draw, so both parts are empty.
     """
-    from flagguard.analysis import ConflictType
-
-    graph_lines = ["flowchart TD"]
+    if not flags:
+        return "", ""
+    mermaid_code = "\n".join(_mermaid_lines(flags, conflicts, max_nodes))
+    return _mermaid_iframe(mermaid_code), mermaid_code
+
+
+# Characters not allowed in Mermaid node ids
+_MERMAID_ID_TRANS = str.maketrans("-.", "__")
+_MERMAID_CLASS_DEFS = (
+    "    classDef active fill:#d4af37,stroke:#b8962f,stroke-width:3px,color:#000,font-weight:bold",
+    "    classDef inactive fill:#333333,stroke:#555555,stroke-width:2px,color:#94a3b8",
+    "    classDef conflict fill:#dc2626,stroke:#991b1b,stroke-width:3px,color:#fff,font-weight:bold",
+    "    classDef violation fill:#f59e0b,stroke:#d4af37,stroke-width:3px,color:#000,font-weight:bold",
+)
+
+def _mermaid_lines(flags: list, conflicts: list, max_nodes: int = MAX_GRAPH_NODES):
+    """Yield the Mermaid flowchart lines for flags and conflicts.
+
+    Node ids are sanitized once per flag name and reused for every edge.
+    When there are more than max_nodes flags, only max_nodes of them are
+    drawn, enabled flags first, along with the edges between them.
+    """
+    total = len(flags)
+    shown: Optional[set[str]] = None   # None → draw every flag and edge
+    if total > max_nodes:
+        flags = sorted(flags, key=lambda f: not f.enabled)[:max_nodes]
+        shown = {f.name for f in flags}
+
+    ids: dict[str, str] = {}
+    # Repeated dependencies and conflict pairs add nothing to the diagram
+    # but still cost Mermaid layout time, so each edge is emitted once
+    seen_edges: set[tuple[str, str, str]] = set()
+
+    def node_id(name: str) -> str:
+        safe = ids.get(name)
+        if safe is None:
+            safe = ids[name] = name.translate(_MERMAID_ID_TRANS)
+        return safe
+
+    yield "flowchart TD"
+    if shown is not None:
+        yield f"    %% Showing {len(flags)} of {total} flags"
     for f in flags:
         style = ":::active" if f.enabled else ":::inactive"
-        name = f.name.replace("-", "_").replace(".", "_")
+        name = node_id(f.name)
         label = f.name.replace('"', "'")
-        graph_lines.append(f'    {name}["{label}"]{style}')
+        yield f'    {name}["{label}"]{style}'
         for dep in f.dependencies:
-            dep_name = dep.replace("-", "_").replace(".", "_")
-            graph_lines.append(f"    {name} -->|REQUIRES| {dep_name}")
+            if shown is None or dep in shown:
+                dep_name = node_id(dep)
+                edge = ("requires", name, dep_name)
+                if edge not in seen_edges:
+                    seen_edges.add(edge)
+                    yield f"    {name} -->|REQUIRES| {dep_name}"
 
     for c in conflicts:
         if len(c.flags_involved) >= 2:
-            f1 = c.flags_involved[0].replace("-", "_").replace(".", "_")
-            f2 = c.flags_involved[1].replace("-", "_").replace(".", "_")
+            if shown is not None and not (
+                c.flags_involved[0] in shown and c.flags_involved[1] in shown
+            ):
+                continue
+            f1 = node_id(c.flags_involved[0])
+            f2 = node_id(c.flags_involved[1])
+            if f1 == f2:
+                continue
+            if c.conflict_type == ConflictType.MUTUAL_EXCLUSION:
+                # Undirected, so A x--x B and B x--x A are the same edge
+                edge = ("excludes", *sorted((f1, f2)))
+            else:
+                edge = (c.conflict_type.value, f1, f2)
+            if edge in seen_edges:
+                continue
+            seen_edges.add(edge)
             if c.conflict_type == ConflictType.MUTUAL_EXCLUSION:
-                graph_lines.append(f"    {f1} x--x {f2}")
-                graph_lines.append(f"    {f1}:::conflict")
-                graph_lines.append(f"    {f2}:::conflict")
+                yield f"    {f1} x--x {f2}"
+                yield f"    {f1}:::conflict"
+                yield f"    {f2}:::conflict"
             elif c.conflict_type == ConflictType.DEPENDENCY_VIOLATION:
-                graph_lines.append(f"    {f1} ==>|MISSING| {f2}")
-                graph_lines.append(f"    {f1}:::violation")
+                yield f"    {f1} ==>|MISSING| {f2}"
+                yield f"    {f1}:::violation"
+
+    yield from _MERMAID_CLASS_DEFS
+
+
+@lru_cache(maxsize=32)
+def _mermaid_iframe(mermaid_code: str) -> str:
+    """Build the base64 iframe for a Mermaid graph.
 
-    graph_lines.append("    classDef active fill:#d4af37,stroke:#b8962f,stroke-width:3px,color:#000,font-weight:bold")
-    graph_lines.append("    classDef inactive fill:#333333,stroke:#555555,stroke-width:2px,color:#94a3b8")
-    graph_lines.append("    classDef conflict fill:#dc2626,stroke:#991b1b,stroke-width:3px,color:#fff,font-weight:bold")
-    graph_lines.append("    classDef violation fill:#f59e0b,stroke:#d4af37,stroke-width:3px,color:#000,font-weight:bold")
+    Cached on the graph source, so re-analysing an unchanged config reuses
+    the embedded page instead of rebuilding and re-encoding it.
+    """
+    svg = _render_mermaid_svg(mermaid_code)
+    if svg is not None:
+        graph_script = ""
+    else:
+        svg = ""
+        # KEY FIX: Use json.dumps() to safely embed the mermaid string in JS
+        # This avoids Python f-string brace collision AND properly escapes special chars
+        mermaid_js_string = json.dumps(mermaid_code)
+        mermaid_config = json.dumps(_MERMAID_CONFIG)
+        graph_script = f"""<script type="module">
+    // THE FIX: inject mermaid code via JS variable (no Python f-string brace conflicts)
+    const mermaidCode = {mermaid_js_string};
+    const container = document.getElementById('graph-content');
 
-    mermaid_code = "\n".join(graph_lines)
+    // mermaid.js is only fetched once the graph is on screen, so it is not
+    // downloaded for analyses whose Graph tab is never opened
+    async function renderGraph() {{
+        try {{
+            const {{ default: mermaid }} = await import('https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs');
+            mermaid.initialize({{ startOnLoad: false, ...{mermaid_config} }});
+            const {{ svg }} = await mermaid.render('graph-svg', mermaidCode);
+            container.innerHTML = svg;
+            // Make SVG responsive
+            const svgEl = container.querySelector('svg');
+            if (svgEl) {{
+                svgEl.style.width = '100%';
+                svgEl.style.height = 'auto';
+                svgEl.style.maxHeight = '560px';
+            }}
+        }} catch (err) {{
+            container.innerHTML = '<div class="error-msg">Graph error: ' + err.message + '<br/><small>Check Mermaid code in the Report tab</small></div>';
+        }}
+    }}
 
-    # KEY FIX: Use json.dumps() to safely embed the mermaid string in JS
-    # This avoids Python f-string brace collision AND properly escapes special chars
-    mermaid_js_string = json.dumps(mermaid_code)
+    if ('IntersectionObserver' in window) {{
+        const observer = new IntersectionObserver((entries) => {{
+            if (entries.some((e) => e.isIntersecting)) {{
+                observer.disconnect();
+                renderGraph();
+            }}
+        }});
+        observer.observe(container);
+    }} else {{
+        renderGraph();
+    }}
+</script>"""
 
     html_content = f"""<!DOCTYPE html>
 <html>
@@ -158,6 +382,7 @@ body {{
     padding: 12px; overflow: auto; position: relative;
 }}
 #graph-content {{ width: 100%; height: 100%; min-height: 500px; }}
+#graph-content svg {{ width: 100%; height: auto; max-height: 560px; }}
 .error-msg {{ color: #ef4444; text-align: center; padding: 40px; font-family: Outfit; }}
 </style>
 </head>
@@ -173,97 +398,152 @@ body {{
         </div>
     </div>
     <div class="graph-panel">
-        <div id="graph-content"></div>
+        <div id="graph-content">{svg}</div>
     </div>
 </div>
-<script type="module">
-    import mermaid from 'https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs';
-
-    mermaid.initialize({{
-        startOnLoad: false,
-        theme: 'dark',
-        themeVariables: {{
-            darkMode: true,
-            background: '#0a1929',
-            primaryColor: '#d4af37',
-            primaryTextColor: '#000',
-            primaryBorderColor: '#b8962f',
-            lineColor: '#94a3b8',
-            secondaryColor: '#1e3a5f',
-            tertiaryColor: '#152940'
-        }},
-        flowchart: {{ htmlLabels: true, curve: 'basis', padding: 20 }}
-    }});
-
-    // THE FIX: inject mermaid code via JS variable (no Python f-string brace conflicts)
-    const mermaidCode = {mermaid_js_string};
-    const container = document.getElementById('graph-content');
-
-    try {{
-        const {{ svg }} = await mermaid.render('graph-svg', mermaidCode);
-        container.innerHTML = svg;
-        // Make SVG responsive
-        const svgEl = container.querySelector('svg');
-        if (svgEl) {{
-            svgEl.style.width = '100%';
-            svgEl.style.height = 'auto';
-            svgEl.style.maxHeight = '560px';
-        }}
-    }} catch (err) {{
-        container.innerHTML = '<div class="error-msg">Graph error: ' + err.message + '<br/><small>Check Mermaid code in the Report tab</small></div>';
-    }}
-</script>
+{graph_script}
 </body>
 </html>"""
 
     encoded = base64.b64encode(html_content.encode('utf-8')).decode('utf-8')
-    iframe = f'<iframe src="data:text/html;base64,{encoded}" style="width:100%; height:620px; border:none; border-radius:12px;"></iframe>'
-    return iframe, mermaid_code
+    return f'<iframe src="data:text/html;base64,{encoded}" style="width:100%; height:620px; border:none; border-radius:12px;"></iframe>'
+
+# (st_mtime_ns, st_size) of HISTORY_FILE → parsed entries
+_history_cache: Optional[tuple[tuple[int, int], list[dict]]] = None
+_legacy_history_checked = False
+
+def _migrate_legacy_history():
+    """Convert a legacy scan_history.json array to JSONL, once per process.
+
+    Only runs when the JSONL file does not exist yet. The old file is
+    renamed to scan_history.json.migrated once its entries are written.
+    """
+    global _legacy_history_checked
+    if _legacy_history_checked:
+        return
+    _legacy_history_checked = True
+    if HISTORY_FILE.exists() or not _LEGACY_HISTORY_FILE.exists():
+        return
+    try:
+        entries = json.loads(_LEGACY_HISTORY_FILE.read_text(encoding="utf-8"))
+        if not isinstance(entries, list):
+            return
+        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = HISTORY_FILE.with_suffix(".jsonl.tmp")
+        tmp.write_text(
+            "".join(json.dumps(entry) + "\n" for entry in reversed(entries[:HISTORY_LIMIT])),
+            encoding="utf-8",
+        )
+        tmp.replace(HISTORY_FILE)
+        _LEGACY_HISTORY_FILE.replace(_LEGACY_HISTORY_FILE.with_suffix(".json.migrated"))
+    except Exception:
+        pass  # the legacy file is left in place for the next start
 
 def load_history() -> list[dict]:
+    """Return up to HISTORY_LIMIT scan entries, newest first.
+
+    The parsed entries are reused until the file's mtime or size changes.
+    """
+    global _history_cache
+    _migrate_legacy_history()
+    try:
+        st = HISTORY_FILE.stat()
+    except OSError:
+        return []
+    key = (st.st_mtime_ns, st.st_size)
+    if _history_cache is not None and _history_cache[0] == key:
+        return list(_history_cache[1])
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
     try:
-        if HISTORY_FILE.exists():
-            with open(HISTORY_FILE, "r") as f:
-                return json.load(f)
+        with open(HISTORY_FILE, "rb") as f:
+            tail = deque(f, maxlen=HISTORY_LIMIT)
+        history = []
+        for line in reversed(tail):
+            try:
+                history.append(loads(line))
+            except ValueError:
+                continue  # torn write from an interrupted append
     except Exception:
-        pass
-    return []
+        return []
+    _history_cache = (key, history)
+    return list(history)
 
 def save_history_entry(entry: dict):
+    """Append a scan entry without rewriting the existing history."""
+    _migrate_legacy_history()
     try:
-        history = load_history()
-        history.insert(0, entry)
         HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(HISTORY_FILE, "w") as f:
-            json.dump(history[:50], f)
+        if ORJSON_AVAILABLE:
+            line = orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+        else:
+            line = (json.dumps(entry) + "\n").encode("utf-8")
+        with open(HISTORY_FILE, "ab") as f:
+            f.write(line)
+        if HISTORY_FILE.stat().st_size > _HISTORY_COMPACT_BYTES:
+            _compact_history()
     except Exception:
         pass
 
+def _compact_history():
+    """Trim the history file to its last HISTORY_LIMIT lines."""
+    with open(HISTORY_FILE, "rb") as f:
+        tail = deque(f, maxlen=HISTORY_LIMIT)
+    tmp = HISTORY_FILE.with_suffix(".jsonl.tmp")
+    tmp.write_bytes(b"".join(tail))
+    tmp.replace(HISTORY_FILE)
+
 # ── Analysis Cache ───────────────────────────────────────────────────────────
-_analysis_cache: dict = {}   # key: sha256 hex → {"result": ..., "ts": float}
+_analysis_cache: dict = {}   # key: blake2b hex + LLM flag → {"result": ..., "ts": float}
 _CACHE_TTL = 600             # 10 minutes
+_CACHE_MAX_ENTRIES = 16      # oldest entries are evicted first
+
 
+# Connected Ollama client shared across analyses. Creating one probes the
+# server, which can take seconds when Ollama is down, so the result
+# (connected or not) is reused for _OLLAMA_RECHECK_SECONDS.
+_OLLAMA_RECHECK_SECONDS = 120
+_ollama_client = None
+_ollama_checked_at = float("-inf")
 
-def _file_content_hash(file_obj) -> str:
-    """SHA256 of file bytes — used as cache key."""
+
+def _get_ollama_client():
+    """Return a connected OllamaClient, or None if Ollama is unavailable."""
+    global _ollama_client, _ollama_checked_at
+    now = _time.monotonic()
+    if now - _ollama_checked_at >= _OLLAMA_RECHECK_SECONDS:
+        from flagguard.llm import OllamaClient
+        client = OllamaClient()
+        _ollama_client = client if client.is_available else None
+        _ollama_checked_at = now
+    return _ollama_client
+
+
+def _read_upload(file_obj) -> Optional[bytes]:
+    """Read the uploaded file once; the bytes feed both the cache key and the parser."""
     try:
         with open(file_obj.name, "rb") as f:
-            return hashlib.sha256(f.read()).hexdigest()
+            return f.read()
     except Exception:
-        return ""
+        return None
 
 
 def run_analysis(config_file, source_file, use_llm, progress=gr.Progress()):
     """Core analysis logic — shared by all role dashboards.
 
-    Results are cached by config-file SHA256 for up to 10 minutes so that
-    repeated runs on an identical manifest skip the expensive Z3 + LLM calls.
+    Results are cached by config-file hash and LLM setting for up to 10
+    minutes so that repeated runs on an identical manifest skip the
+    expensive Z3 + LLM calls.
     """
     if not config_file:
         return [0, 0, 0, 0, "0%", None, None, "No scan data.", "", ""]
 
     # ── Cache check ──────────────────────────────────────────────────────
-    cache_key = _file_content_hash(config_file)
+    config_bytes = _read_upload(config_file)
+    cache_key = ""
+    if config_bytes is not None:
+        # Reports with and without LLM explanations differ, so key on both
+        digest = hashlib.blake2b(config_bytes, digest_size=16).hexdigest()
+        cache_key = f"{digest}:{'llm' if use_llm else 'nollm'}"
     if cache_key and cache_key in _analysis_cache:
         entry = _analysis_cache[cache_key]
         age = _time.time() - entry["ts"]
@@ -276,11 +556,10 @@ def run_analysis(config_file, source_file, use_llm, progress=gr.Progress()):
 
     try:
         progress(0.1, desc="Initializing...")
-        from flagguard.parsers import parse_config
-        from flagguard.analysis import FlagSATSolver, ConflictDetector, ConflictType
-        from flagguard.reporters import MarkdownReporter
-
-        flags = parse_config(Path(config_file.name))
+        if config_bytes is not None:
+            flags = parse_config_text(config_bytes.decode("utf-8"))
+        else:
+            flags = parse_config(Path(config_file.name))
 
         progress(0.4, desc="Scanning Dependencies...")
         solver = FlagSATSolver()
@@ -288,20 +567,19 @@ def run_analysis(config_file, source_file, use_llm, progress=gr.Progress()):
         detector.load_flags(flags)
         conflicts = detector.detect_all_conflicts()
 
-        from flagguard.analysis import ConflictType
-        mutual_exclusions = [c for c in conflicts if c.conflict_type == ConflictType.MUTUAL_EXCLUSION]
-        dependency_violations = [c for c in conflicts if c.conflict_type == ConflictType.DEPENDENCY_VIOLATION]
+        conflicts_by_type = Counter(c.conflict_type for c in conflicts)
 
         summary = ""
         if use_llm and conflicts:
             progress(0.6, desc="AI Analysis...")
             try:
-                from flagguard.llm import OllamaClient, ExplanationEngine
-                client = OllamaClient()
-                if client.is_available:
+                from flagguard.llm import ExplanationEngine
+                client = _get_ollama_client()
+                if client is not None:
                     engine = ExplanationEngine(client)
-                    for c in conflicts[:5]:
-                        c.llm_explanation = engine.explain_conflict(c)
+                    top = conflicts[:5]
+                    for c, explanation in zip(top, engine.explain_conflicts(top)):
+                        c.llm_explanation = explanation
                     summary = engine.generate_executive_summary(len(flags), conflicts, [])
             except Exception:
                 pass
@@ -309,17 +587,17 @@ def run_analysis(config_file, source_file, use_llm, progress=gr.Progress()):
         progress(0.8, desc="Generating Report...")
 
         m_flags = len(flags)
-        m_conflicts = len(mutual_exclusions)
-        m_dependencies = len(dependency_violations)
+        m_conflicts = conflicts_by_type[ConflictType.MUTUAL_EXCLUSION]
+        m_dependencies = conflicts_by_type[ConflictType.DEPENDENCY_VIOLATION]
         m_enabled = sum(1 for f in flags if f.enabled)
         total_issues = len(conflicts)
         health_ratio = 1 - (total_issues / len(flags) if len(flags) > 0 else 0)
         m_health = f"{int(max(0, health_ratio) * 100)}%"
 
-        fig1, fig2 = create_charts(flags, conflicts)
+        fig1, fig2 = create_charts(flags, conflicts, enabled_count=m_enabled)
 
         reporter = MarkdownReporter()
-        report_md = reporter.generate_report(flags, conflicts, [], summary)
+        report_md = _truncate_report(reporter.generate_report(flags, conflicts, [], summary))
 
         iframe_html, mermaid_code = generate_mermaid_html(flags, conflicts)
 
@@ -343,10 +621,22 @@ def run_analysis(config_file, source_file, use_llm, progress=gr.Progress()):
                 result = (m_flags, m_conflicts, m_dependencies, m_enabled, m_health,
                           fig1, fig2, report_md, iframe_html, mermaid_code)
                 _analysis_cache[cache_key] = {"result": result, "ts": _time.time()}
+                while len(_analysis_cache) > _CACHE_MAX_ENTRIES:
+                    del _analysis_cache[next(iter(_analysis_cache))]
                 print(f"[CACHE] MISS — stored result for {cache_key[:12]}...")
             except NameError:
                 pass  # analysis failed before producing results
 
+def _truncate_report(report_md: str, max_lines: int = MAX_UI_REPORT_LINES) -> str:
+    """Cap the report at max_lines for display, noting where it was cut."""
+    if report_md.count("\n") < max_lines:
+        return report_md
+    head = report_md.split("\n", max_lines)[:max_lines]
+    return "\n".join(head) + (
+        f"\n\n*Report truncated after {max_lines} lines. Run "
+        f"`flagguard analyze --format markdown` for the full report.*"
+    )
+
 def format_conflicts_list(conflicts) -> str:
     if not conflicts:
         return "No conflicts detected."
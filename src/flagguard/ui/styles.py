@@ -1,8 +1,24 @@
 """Shared CSS styles and Gradio theme for FlagGuard UI."""
 
+import re
+
 import gradio as gr
 
-LIQUID_GLASS_CSS = """
+
+def _minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from CSS.
+
+    Whitespace around ':' is kept, since it is significant in selectors
+    (`.a :hover` vs `.a:hover`).
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+# Minified once at import; the readable source stays below
+LIQUID_GLASS_CSS = _minify_css("""
 @import url('https://fonts.googleapis.com/css2?family=Outfit:wght@300;400;500;600;700;800;900&family=Inter:wght@300;400;500;600;700&family=JetBrains+Mono:wght@400;500;700&display=swap');
 
 :root {
@@ -436,7 +452,7 @@ body.light-mode pre, body.light-mode code {
     top: 0;
 }
 
-"""
+""")
 
 
 def get_theme():
@@ -11,83 +11,119 @@ from flagguard.core.models import (
     FlagType,
     FlagVariation,
 )
+from flagguard.parsers.ast import JavaScriptFlagExtractor, PythonFlagExtractor
+
+def _dump_config(config: dict) -> bytes:
+    """Serialize a fixture config as compact UTF-8 JSON."""
+    return json.dumps(config, separators=(",", ":")).encode("utf-8")
+
+
+# Fixture configs are static, so each is serialized once at import time
+_LAUNCHDARKLY_CONFIG_BYTES = _dump_config({
+    "flags": {
+        "new_checkout": {
+            "key": "new_checkout",
+            "on": True,
+            "variations": [True, False],
+            "fallthrough": {"variation": 0},
+            "prerequisites": [{"key": "payment_enabled"}],
+            "description": "New checkout flow",
+            "tags": ["checkout", "ui"],
+        },
+        "payment_enabled": {
+            "key": "payment_enabled",
+            "on": False,
+            "variations": [True, False],
+            "fallthrough": {"variation": 1},
+            "description": "Payment system toggle",
+        },
+        "premium_tier": {
+            "key": "premium_tier",
+            "on": True,
+            "variations": [True, False],
+            "fallthrough": {"variation": 0},
+            "prerequisites": [{"key": "payment_enabled"}],
+        },
+    }
+})
+
+_GENERIC_CONFIG_BYTES = _dump_config({
+    "flags": [
+        {
+            "name": "feature_a",
+            "enabled": True,
+            "type": "boolean",
+        },
+        {
+            "name": "feature_b",
+            "enabled": True,
+            "type": "boolean",
+            "dependencies": ["feature_a"],
+        },
+        {
+            "name": "feature_c",
+            "enabled": False,
+            "type": "boolean",
+        },
+    ]
+})
 
 
-@pytest.fixture
-def fixtures_dir() -> Path:
-    """Return the path to test fixtures directory."""
-    return Path(__file__).parent / "fixtures"
+@pytest.fixture(scope="session")
+def fixtures_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Return a per-session directory for generated fixture files.
+    
+    Generated files stay out of the source tree, so concurrent sessions
+    (e.g. pytest-xdist workers) never write to the same path.
+    """
+    return tmp_path_factory.mktemp("fixtures")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_launchdarkly_config(fixtures_dir: Path) -> Path:
     """Create a sample LaunchDarkly config file."""
     config_path = fixtures_dir / "configs" / "launchdarkly.json"
     config_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    config = {
-        "flags": {
-            "new_checkout": {
-                "key": "new_checkout",
-                "on": True,
-                "variations": [True, False],
-                "fallthrough": {"variation": 0},
-                "prerequisites": [{"key": "payment_enabled"}],
-                "description": "New checkout flow",
-                "tags": ["checkout", "ui"],
-            },
-            "payment_enabled": {
-                "key": "payment_enabled",
-                "on": False,
-                "variations": [True, False],
-                "fallthrough": {"variation": 1},
-                "description": "Payment system toggle",
-            },
-            "premium_tier": {
-                "key": "premium_tier",
-                "on": True,
-                "variations": [True, False],
-                "fallthrough": {"variation": 0},
-                "prerequisites": [{"key": "payment_enabled"}],
-            },
-        }
-    }
-    
-    config_path.write_text(json.dumps(config, indent=2))
+    config_path.write_bytes(_LAUNCHDARKLY_CONFIG_BYTES)
     return config_path
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_generic_config(fixtures_dir: Path) -> Path:
     """Create a sample generic JSON config file."""
     config_path = fixtures_dir / "configs" / "generic.json"
     config_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    config = {
-        "flags": [
-            {
-                "name": "feature_a",
-                "enabled": True,
-                "type": "boolean",
-            },
-            {
-                "name": "feature_b",
-                "enabled": True,
-                "type": "boolean",
-                "dependencies": ["feature_a"],
-            },
-            {
-                "name": "feature_c",
-                "enabled": False,
-                "type": "boolean",
-            },
-        ]
-    }
-    
-    config_path.write_text(json.dumps(config, indent=2))
+    config_path.write_bytes(_GENERIC_CONFIG_BYTES)
     return config_path
 
 
+@pytest.fixture(scope="session")
+def sample_launchdarkly_content() -> str:
+    """Return the sample LaunchDarkly config as text, for parser.parse()."""
+    return _LAUNCHDARKLY_CONFIG_BYTES.decode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def sample_generic_content() -> str:
+    """Return the sample generic config as text, for parser.parse()."""
+    return _GENERIC_CONFIG_BYTES.decode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def python_extractor() -> PythonFlagExtractor:
+    """Return one Python extractor shared by the whole session.
+
+    Results are cached, so fixtures parsed by several tests are parsed once.
+    """
+    return PythonFlagExtractor(cache_results=True)
+
+
+@pytest.fixture(scope="session")
+def javascript_extractor() -> JavaScriptFlagExtractor:
+    """Return one JavaScript extractor shared by the whole session."""
+    return JavaScriptFlagExtractor()
+
+
 @pytest.fixture
 def sample_flags() -> list[FlagDefinition]:
     """Return sample flag definitions for testing."""
@@ -119,13 +155,12 @@ def sample_flags() -> list[FlagDefinition]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_python_source(fixtures_dir: Path) -> Path:
     """Create a sample Python source file with flag usages."""
     source_path = fixtures_dir / "source_code" / "python_sample" / "app.py"
-    source_path.parent.mkdir(parents=True, exist_ok=True)
     
-    code = '''"""Sample application with feature flags."""
+    code = b'''"""Sample application with feature flags."""
 
 from feature_flags import is_enabled, variation
 
@@ -160,17 +195,17 @@ class FeatureManager:
         return variation("ab_test_variant", "control")
 '''
     
-    source_path.write_text(code)
+    source_path.parent.mkdir(parents=True, exist_ok=True)
+    source_path.write_bytes(code)
     return source_path
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_js_source(fixtures_dir: Path) -> Path:
     """Create a sample JavaScript source file with flag usages."""
     source_path = fixtures_dir / "source_code" / "javascript_sample" / "app.js"
-    source_path.parent.mkdir(parents=True, exist_ok=True)
     
-    code = '''// Sample application with feature flags
+    code = b'''// Sample application with feature flags
 import { isEnabled, useFlag } from "@launchdarkly/js-client-sdk";
 
 function CheckoutComponent() {
@@ -191,5 +226,6 @@ function PaymentHandler() {
 const isPremium = isEnabled("premium_tier");
 '''
     
-    source_path.write_text(code)
+    source_path.parent.mkdir(parents=True, exist_ok=True)
+    source_path.write_bytes(code)
     return source_path
@@ -4,21 +4,31 @@ import json
 import pytest
 from pathlib import Path
 
+from click.testing import CliRunner
+
+from flagguard.cli.main import cli
+from flagguard.core.orchestrator import FlagGuardAnalyzer
+
+@pytest.fixture(scope="class")
+def analyzer() -> FlagGuardAnalyzer:
+    """An analyzer without LLM explanations, shared by a test class.
+    
+    FlagGuardAnalyzer keeps no per-run state, so reuse is safe.
+    """
+    return FlagGuardAnalyzer(explain_with_llm=False)
+
 
 class TestFullPipeline:
     """Test complete analysis flow from config to report."""
     
     def test_analyze_clean_config(
         self,
+        analyzer: FlagGuardAnalyzer,
         sample_launchdarkly_config: Path,
         sample_python_source: Path,
         tmp_path: Path,
     ) -> None:
         """Analyze config without critical conflicts."""
-        from flagguard.core.orchestrator import FlagGuardAnalyzer
-        
-        analyzer = FlagGuardAnalyzer(explain_with_llm=False)
-        
         output_path = tmp_path / "report.md"
         report = analyzer.analyze(
             config_path=sample_launchdarkly_config,
@@ -33,15 +43,12 @@ class TestFullPipeline:
     
     def test_analyze_with_json_output(
         self,
+        analyzer: FlagGuardAnalyzer,
         sample_launchdarkly_config: Path,
         sample_python_source: Path,
         tmp_path: Path,
     ) -> None:
         """Test JSON report output format."""
-        from flagguard.core.orchestrator import FlagGuardAnalyzer
-        
-        analyzer = FlagGuardAnalyzer(explain_with_llm=False)
-        
         output_path = tmp_path / "report.json"
         report = analyzer.analyze(
             config_path=sample_launchdarkly_config,
@@ -53,17 +60,16 @@ class TestFullPipeline:
         assert output_path.exists()
         
         # Verify it's valid JSON
-        data = json.loads(output_path.read_text())
+        data = json.loads(output_path.read_bytes())
         assert "timestamp" in data
         assert "conflicts" in data
     
     def test_analyze_flags_with_dependencies(
         self,
+        analyzer: FlagGuardAnalyzer,
         tmp_path: Path,
     ) -> None:
         """Test analysis with flag dependencies."""
-        from flagguard.core.orchestrator import FlagGuardAnalyzer
-        
         # Create config with dependency chain
         config = {
             "flags": {
@@ -84,7 +90,6 @@ class TestFullPipeline:
         source_dir.mkdir()
         (source_dir / "app.py").write_text('if is_enabled("child"): pass')
         
-        analyzer = FlagGuardAnalyzer(explain_with_llm=False)
         report = analyzer.analyze(
             config_path=config_path,
             source_path=source_dir,
@@ -94,43 +99,45 @@ class TestFullPipeline:
         assert report["files_scanned"] == 1
 
 
+@pytest.fixture(scope="class")
+def cli_runner():
+    """A CliRunner and the cli group, shared by a test class."""
+    return CliRunner(), cli
+
+
 class TestCLIIntegration:
     """Test CLI commands end-to-end."""
     
     def test_cli_analyze_command(
         self,
+        cli_runner,
         sample_launchdarkly_config: Path,
         sample_python_source: Path,
     ) -> None:
         """Test CLI analyze command."""
-        from click.testing import CliRunner
-        from flagguard.cli.main import cli
-        
-        runner = CliRunner()
+        runner, cli = cli_runner
         result = runner.invoke(cli, [
             "analyze",
             "--config", str(sample_launchdarkly_config),
             "--source", str(sample_python_source.parent),
             "--no-llm",
             "--format", "text",
-        ])
+        ], catch_exceptions=False)
         
         # May exit 1 if conflicts found, check output
         assert "Loaded" in result.output or "flags" in result.output.lower()
     
     def test_cli_parse_command(
         self,
+        cli_runner,
         sample_launchdarkly_config: Path,
     ) -> None:
         """Test CLI parse command."""
-        from click.testing import CliRunner
-        from flagguard.cli.main import cli
-        
-        runner = CliRunner()
+        runner, cli = cli_runner
         result = runner.invoke(cli, [
             "parse",
             "--config", str(sample_launchdarkly_config),
-        ])
+        ], catch_exceptions=False)
         
         assert result.exit_code == 0
         # Should show table with flag names
@@ -138,21 +145,19 @@ class TestCLIIntegration:
     
     def test_cli_graph_command(
         self,
+        cli_runner,
         sample_launchdarkly_config: Path,
         tmp_path: Path,
     ) -> None:
         """Test CLI graph command."""
-        from click.testing import CliRunner
-        from flagguard.cli.main import cli
-        
-        runner = CliRunner()
+        runner, cli = cli_runner
         output_file = tmp_path / "graph.mmd"
         
         result = runner.invoke(cli, [
             "graph",
             "--config", str(sample_launchdarkly_config),
             "--output", str(output_file),
-        ])
+        ], catch_exceptions=False)
         
         assert result.exit_code == 0
         assert output_file.exists()
@@ -160,22 +165,15 @@ class TestCLIIntegration:
     
     def test_cli_init_command(
         self,
+        cli_runner,
         tmp_path: Path,
+        monkeypatch,
     ) -> None:
         """Test CLI init command."""
-        from click.testing import CliRunner
-        from flagguard.cli.main import cli
-        import os
+        runner, cli = cli_runner
+        monkeypatch.chdir(tmp_path)
         
-        # Change to temp directory
-        original_cwd = os.getcwd()
-        os.chdir(tmp_path)
+        result = runner.invoke(cli, ["init"], catch_exceptions=False)
         
-        try:
-            runner = CliRunner()
-            result = runner.invoke(cli, ["init"])
-            
-            assert result.exit_code == 0
-            assert (tmp_path / ".flagguard.yaml").exists()
-        finally:
-            os.chdir(original_cwd)
+        assert result.exit_code == 0
+        assert (tmp_path / ".flagguard.yaml").exists()
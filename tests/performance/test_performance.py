@@ -7,9 +7,117 @@ and end-to-end pipeline throughput at enterprise scale.
 
 import json
 import time
+import tracemalloc
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+from flagguard.analysis import ConflictDetector, FlagSATSolver
+from flagguard.analysis.constraint_encoder import ConstraintEncoder
+from flagguard.core.models import FlagDefinition, FlagType
+from flagguard.parsers import parse_config
+from flagguard.parsers.ast import SourceScanner
+from flagguard.parsers.unleash import UnleashParser
+
+# pytest-benchmark is optional; without it benchmarks are timed once
+try:
+    import pytest_benchmark  # noqa: F401
+    BENCHMARK_AVAILABLE = True
+except ImportError:
+    BENCHMARK_AVAILABLE = False
+
+
+@lru_cache(maxsize=None)
+def _chain_config(n: int, chain_from: int = 1, alternate: bool = True) -> bytes:
+    """Build a LaunchDarkly config of n flags, each requiring the previous one.
+    
+    Flags from chain_from onwards get a prerequisite; with alternate, every
+    other flag is off. The JSON is written as fragments rather than through
+    a dict tree, and each distinct config is built once per session.
+    """
+    buf = bytearray(b'{"flags":{')
+    for i in range(n):
+        if i:
+            buf += b","
+        on = "false" if alternate and i % 2 else "true"
+        prereq = f'{{"key":"flag_{i-1}"}}' if i >= chain_from else ""
+        buf += (
+            f'"flag_{i}":{{"on":{on},"variations":[true,false],'
+            f'"prerequisites":[{prereq}]}}'
+        ).encode()
+    buf += b"}}"
+    return bytes(buf)
+
+
+BENCHMARK_ROUNDS = 5
+
+
+def _time_once(func, *args):
+    """Call func(*args) once, returning (result, seconds)."""
+    start = time.perf_counter_ns()
+    result = func(*args)
+    return result, (time.perf_counter_ns() - start) / 1e9
+
+
+@pytest.fixture
+def timed(request):
+    """Return a runner that calls func(*args) and reports (result, seconds).
+    
+    With pytest-benchmark installed the call goes through its benchmark
+    fixture, which repeats it, records statistics for --benchmark-compare
+    and reports the mean. Without it, or under --benchmark-disable (which
+    collects no statistics), the call is timed once so the duration budgets
+    still apply.
+    """
+    if BENCHMARK_AVAILABLE:
+        benchmark = request.getfixturevalue("benchmark")
+
+        def run(func, *args):
+            if benchmark.disabled:
+                return _time_once(func, *args)
+            result = benchmark.pedantic(func, args=args, rounds=BENCHMARK_ROUNDS)
+            return result, benchmark.stats.stats.mean
+    else:
+        run = _time_once
+    return run
+
+
+def _write_files(files: dict[Path, bytes]) -> None:
+    """Write generated source files concurrently.
+    
+    Setup is dominated by per-file syscalls, which overlap well in threads.
+    Parent directories must already exist.
+    """
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda item: item[0].write_bytes(item[1]), files.items()))
+
+
+# Generated source templates, kept as bytes so files skip text encoding.
+# "{0}" is replaced with the file index.
+_PY_FUNC_TEMPLATE = b'''
+def func_{0}():
+    if is_enabled("flag_{0}"):
+        return {0}
+'''
+_PY_SERVICE_TEMPLATE = b'''
+class Service{0}:
+    def handle(self):
+        if is_enabled("flag_{0}"):
+            return self.process_{0}()
+        if is_enabled("fallback_{0}"):
+            return self.fallback()
+'''
+_PY_CHECK_TEMPLATE = b'if is_enabled("py_flag_{0}"): pass'
+# Filled with %-formatting: two flag indices
+_PY_PAIR_TEMPLATE = b'if is_enabled("flag_%d"): pass\nif is_enabled("flag_%d"): pass'
+_JS_CHECK_TEMPLATE = b'if (isEnabled("js_flag_{0}")) {}'
+
+
+def _fill(template: bytes, i: int) -> bytes:
+    """Substitute the file index into a source template."""
+    return template.replace(b"{0}", str(i).encode())
+
 
 # ─────────────────────────────────────────────────────────────────
 # Config Parsing Performance
@@ -19,33 +127,19 @@ from pathlib import Path
 class TestParsingPerformance:
     """Benchmark configuration parsing performance."""
 
-    def test_parse_100_flags(self, tmp_path: Path) -> None:
-        """Benchmark parsing config with 100 flags."""
-        from flagguard.parsers import parse_config
-
-        # Create config with 100 flags
-        flags = {}
-        for i in range(100):
-            flags[f"flag_{i}"] = {
-                "on": i % 2 == 0,
-                "variations": [True, False],
-                "prerequisites": [{"key": f"flag_{i-1}"}] if i > 0 else [],
-            }
-
-        config_path = tmp_path / "large_config.json"
-        config_path.write_text(json.dumps({"flags": flags}))
+    @pytest.mark.parametrize("n,budget", [(100, 2.0), (1000, 5.0)])
+    def test_parse_n_flags(self, timed, n: int, budget: float, tmp_path: Path) -> None:
+        """Benchmark parsing a config with a chain of n flags."""
+        config_path = tmp_path / f"config_{n}.json"
+        config_path.write_bytes(_chain_config(n))
 
-        start = time.time()
-        parsed = parse_config(config_path)
-        duration = time.time() - start
+        parsed, duration = timed(parse_config, config_path)
 
-        assert len(parsed) == 100
-        assert duration < 2.0, f"Parsing took {duration:.2f}s, expected < 2s"
+        assert len(parsed) == n
+        assert duration < budget, f"Parsing {n} flags took {duration:.2f}s, expected < {budget}s"
 
-    def test_parse_500_flags(self, tmp_path: Path) -> None:
+    def test_parse_500_flags(self, timed, tmp_path: Path) -> None:
         """Benchmark parsing config with 500 flags and complex dependencies."""
-        from flagguard.parsers import parse_config
-
         flags = {}
         for i in range(500):
             prereqs = []
@@ -65,38 +159,13 @@ class TestParsingPerformance:
         config_path = tmp_path / "enterprise_config.json"
         config_path.write_text(json.dumps({"flags": flags}))
 
-        start = time.time()
-        parsed = parse_config(config_path)
-        duration = time.time() - start
+        parsed, duration = timed(parse_config, config_path)
 
         assert len(parsed) == 500
         assert duration < 5.0, f"Parsing 500 flags took {duration:.2f}s, expected < 5s"
 
-    def test_parse_1000_flags(self, tmp_path: Path) -> None:
-        """Benchmark parsing config with 1000 flags."""
-        from flagguard.parsers import parse_config
-
-        flags = {}
-        for i in range(1000):
-            flags[f"flag_{i}"] = {
-                "on": True,
-                "variations": [True, False],
-            }
-
-        config_path = tmp_path / "huge_config.json"
-        config_path.write_text(json.dumps({"flags": flags}))
-
-        start = time.time()
-        parsed = parse_config(config_path)
-        duration = time.time() - start
-
-        assert len(parsed) == 1000
-        assert duration < 5.0, f"Parsing took {duration:.2f}s, expected < 5s"
-
-    def test_parse_unleash_yaml_100_features(self, tmp_path: Path) -> None:
+    def test_parse_unleash_yaml_100_features(self, timed, tmp_path: Path) -> None:
         """Benchmark parsing Unleash YAML with 100 features."""
-        from flagguard.parsers.unleash import UnleashParser
-
         lines = ["features:"]
         for i in range(100):
             lines.append(f"  - name: feature_{i}")
@@ -109,9 +178,7 @@ class TestParsingPerformance:
         yaml_content = "\n".join(lines)
         parser = UnleashParser()
 
-        start = time.time()
-        parsed = parser.parse(yaml_content)
-        duration = time.time() - start
+        parsed, duration = timed(parser.parse, yaml_content)
 
         assert len(parsed) == 100
         assert duration < 3.0, f"YAML parsing took {duration:.2f}s, expected < 3s"
@@ -125,105 +192,85 @@ class TestParsingPerformance:
 class TestScanningPerformance:
     """Benchmark source code scanning performance."""
 
-    def test_scan_100_files(self, tmp_path: Path) -> None:
+    def test_scan_100_files(self, timed, tmp_path: Path) -> None:
         """Benchmark scanning 100 Python files."""
-        from flagguard.parsers.ast import SourceScanner
-
-        # Create 100 Python files
-        for i in range(100):
-            subdir = tmp_path / f"module_{i // 10}"
-            subdir.mkdir(exist_ok=True)
-
-            file_path = subdir / f"file_{i}.py"
-            file_path.write_text(f'''
-def func_{i}():
-    if is_enabled("flag_{i}"):
-        return {i}
-''')
+        # Create 100 Python files across 10 modules
+        for k in range(10):
+            (tmp_path / f"module_{k}").mkdir()
+        _write_files({
+            tmp_path / f"module_{i // 10}" / f"file_{i}.py": _fill(_PY_FUNC_TEMPLATE, i)
+            for i in range(100)
+        })
 
         scanner = SourceScanner()
 
-        start = time.time()
-        usages = scanner.scan_directory(tmp_path)
-        duration = time.time() - start
+        usages, duration = timed(scanner.scan_directory, tmp_path)
 
         assert usages.files_scanned == 100
         assert len(usages.usages) >= 50  # Allow some tolerance
         assert duration < 15.0, f"Scanning took {duration:.2f}s, expected < 15s"
 
-    def test_scan_500_files(self, tmp_path: Path) -> None:
+    def test_scan_500_files(self, timed, tmp_path: Path) -> None:
         """Benchmark scanning 500 Python files across nested modules."""
-        from flagguard.parsers.ast import SourceScanner
+        # Deep nesting: pkg/module/file, with each directory created once
+        subdirs = [tmp_path / f"pkg_{k // 10}" / f"module_{k}" for k in range(50)]
+        for subdir in subdirs:
+            subdir.mkdir(parents=True)
 
-        for i in range(500):
-            # Deep nesting: module/sub/file
-            subdir = tmp_path / f"pkg_{i // 100}" / f"module_{i // 10}"
-            subdir.mkdir(parents=True, exist_ok=True)
-
-            file_path = subdir / f"service_{i}.py"
-            file_path.write_text(f'''
-class Service{i}:
-    def handle(self):
-        if is_enabled("flag_{i}"):
-            return self.process_{i}()
-        if is_enabled("fallback_{i}"):
-            return self.fallback()
-''')
+        _write_files({
+            subdirs[i // 10] / f"service_{i}.py": _fill(_PY_SERVICE_TEMPLATE, i)
+            for i in range(500)
+        })
 
         scanner = SourceScanner()
 
-        start = time.time()
-        usages = scanner.scan_directory(tmp_path)
-        duration = time.time() - start
+        usages, duration = timed(scanner.scan_directory, tmp_path)
 
         assert usages.files_scanned == 500
         assert len(usages.usages) >= 400  # 2 flags per file, allow tolerance
         assert duration < 60.0, f"Scanning 500 files took {duration:.2f}s, expected < 60s"
 
-    def test_scan_mixed_languages(self, tmp_path: Path) -> None:
+    def test_scan_mixed_languages(self, timed, tmp_path: Path) -> None:
         """Benchmark scanning mixed Python and JavaScript files."""
-        from flagguard.parsers.ast import SourceScanner
-
         # Create Python files
         py_dir = tmp_path / "python"
         py_dir.mkdir()
-        for i in range(25):
-            (py_dir / f"app_{i}.py").write_text(f'if is_enabled("py_flag_{i}"): pass')
+        files = {
+            py_dir / f"app_{i}.py": _fill(_PY_CHECK_TEMPLATE, i)
+            for i in range(25)
+        }
 
         # Create JavaScript files
         js_dir = tmp_path / "javascript"
         js_dir.mkdir()
-        for i in range(25):
-            (js_dir / f"app_{i}.js").write_text(f'if (isEnabled("js_flag_{i}")) {{}}')
+        files.update(
+            (js_dir / f"app_{i}.js", _fill(_JS_CHECK_TEMPLATE, i))
+            for i in range(25)
+        )
+        _write_files(files)
 
         scanner = SourceScanner()
 
-        start = time.time()
-        usages = scanner.scan_directory(tmp_path)
-        duration = time.time() - start
+        usages, duration = timed(scanner.scan_directory, tmp_path)
 
         assert usages.files_scanned == 50
         assert duration < 10.0, f"Scanning took {duration:.2f}s, expected < 10s"
 
-    def test_scan_large_files(self, tmp_path: Path) -> None:
+    def test_scan_large_files(self, timed, tmp_path: Path) -> None:
         """Benchmark scanning files with many flag checks per file."""
-        from flagguard.parsers.ast import SourceScanner
-
-        for i in range(20):
-            file_path = tmp_path / f"large_module_{i}.py"
-            lines = []
-            for j in range(50):
-                lines.append(f'def handler_{j}():')
-                lines.append(f'    if is_enabled("flag_{i}_{j}"):')
-                lines.append(f'        return process_{j}()')
-                lines.append('')
-            file_path.write_text('\n'.join(lines))
+        # 50 handlers per module; "{0}" is filled with the module index
+        template = b"\n".join(
+            b'def handler_%d():\n    if is_enabled("flag_{0}_%d"):\n        return process_%d()\n'
+            % (j, j, j)
+            for j in range(50)
+        )
+        _write_files({
+            tmp_path / f"large_module_{i}.py": _fill(template, i) for i in range(20)
+        })
 
         scanner = SourceScanner()
 
-        start = time.time()
-        usages = scanner.scan_directory(tmp_path)
-        duration = time.time() - start
+        usages, duration = timed(scanner.scan_directory, tmp_path)
 
         assert usages.files_scanned == 20
         assert len(usages.usages) >= 500  # 50 flags × 20 files
@@ -238,22 +285,11 @@ class Service{i}:
 class TestConflictDetectionPerformance:
     """Benchmark conflict detection performance."""
 
-    def test_detect_conflicts_50_flags(self, tmp_path: Path) -> None:
+    def test_detect_conflicts_50_flags(self, timed, tmp_path: Path) -> None:
         """Benchmark conflict detection with 50 flags."""
-        from flagguard.parsers import parse_config
-        from flagguard.analysis import FlagSATSolver, ConflictDetector
-
         # Create config with dependencies
-        flags = {}
-        for i in range(50):
-            flags[f"flag_{i}"] = {
-                "on": True,
-                "variations": [True, False],
-                "prerequisites": [{"key": f"flag_{i-1}"}] if i > 5 else [],
-            }
-
         config_path = tmp_path / "config.json"
-        config_path.write_text(json.dumps({"flags": flags}))
+        config_path.write_bytes(_chain_config(50, chain_from=6, alternate=False))
 
         parsed = parse_config(config_path)
 
@@ -261,18 +297,13 @@ class TestConflictDetectionPerformance:
         detector = ConflictDetector(solver)
         detector.load_flags(parsed)
 
-        start = time.time()
-        conflicts = detector.detect_all_conflicts()
-        duration = time.time() - start
+        conflicts, duration = timed(detector.detect_all_conflicts)
 
         # Should complete in reasonable time
         assert duration < 30.0, f"Detection took {duration:.2f}s, expected < 30s"
 
-    def test_detect_conflicts_100_flags_mixed(self, tmp_path: Path) -> None:
+    def test_detect_conflicts_100_flags_mixed(self, timed, tmp_path: Path) -> None:
         """Benchmark conflict detection with 100 flags and mixed constraints."""
-        from flagguard.parsers import parse_config
-        from flagguard.analysis import FlagSATSolver, ConflictDetector
-
         flags = {}
         for i in range(100):
             prereqs = []
@@ -296,17 +327,12 @@ class TestConflictDetectionPerformance:
         detector = ConflictDetector(solver)
         detector.load_flags(parsed)
 
-        start = time.time()
-        conflicts = detector.detect_all_conflicts()
-        duration = time.time() - start
+        conflicts, duration = timed(detector.detect_all_conflicts)
 
         assert duration < 60.0, f"Detection of 100 flags took {duration:.2f}s, expected < 60s"
 
-    def test_constraint_encoding_performance(self) -> None:
+    def test_constraint_encoding_performance(self, timed) -> None:
         """Benchmark encoding 200 flags into SAT constraints."""
-        from flagguard.analysis.constraint_encoder import ConstraintEncoder
-        from flagguard.core.models import FlagDefinition, FlagType
-
         flags = []
         for i in range(200):
             deps = []
@@ -321,11 +347,9 @@ class TestConflictDetectionPerformance:
                 dependencies=deps,
             ))
 
-        encoder = ConstraintEncoder()
-
-        start = time.time()
-        solver = encoder.encode_flags(flags)
-        duration = time.time() - start
+        # A fresh encoder per round: re-adding constraints to the same
+        # solver is skipped, which would time no-ops after the first round
+        solver, duration = timed(lambda f: ConstraintEncoder().encode_flags(f), flags)
 
         assert len(solver.variables) == 200
         assert duration < 10.0, f"Encoding 200 flags took {duration:.2f}s, expected < 10s"
@@ -341,35 +365,29 @@ class TestMemoryPerformance:
 
     def test_memory_usage_large_scan(self, tmp_path: Path) -> None:
         """Memory usage should stay reasonable for large scans."""
-        import sys
-        from flagguard.parsers.ast import SourceScanner
-
         # Create 50 files with moderate content
-        for i in range(50):
-            file_path = tmp_path / f"file_{i}.py"
-            lines = [f'if is_enabled("flag_{j}"): pass' for j in range(10)]
-            file_path.write_text("\n".join(lines))
+        content = b"\n".join(b'if is_enabled("flag_%d"): pass' % j for j in range(10))
+        _write_files({tmp_path / f"file_{i}.py": content for i in range(50)})
 
         scanner = SourceScanner()
 
-        # Get baseline memory
-        initial_size = sys.getsizeof(scanner)
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
 
         usages = scanner.scan_directory(tmp_path)
 
-        # Result should not be excessively large
-        result_size = sys.getsizeof(usages) + sum(
-            sys.getsizeof(u) for u in usages.usages
-        )
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        # Memory still held after the scan, including the usages' strings
+        retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
 
+        assert usages.files_scanned == 50
         # Very rough check - result shouldn't be > 10MB
-        assert result_size < 10 * 1024 * 1024, f"Result size: {result_size / 1024 / 1024:.2f}MB"
+        assert retained < 10 * 1024 * 1024, f"Retained: {retained / 1024 / 1024:.2f}MB"
 
     def test_memory_usage_solver(self) -> None:
         """SAT solver memory should stay bounded with many variables."""
-        import tracemalloc
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
         tracemalloc.start()
 
         solver = FlagSATSolver()
@@ -397,10 +415,6 @@ class TestEndToEndPerformance:
 
     def test_full_pipeline_small(self, tmp_path: Path) -> None:
         """End-to-end: 20 flags + 10 source files."""
-        from flagguard.parsers import parse_config
-        from flagguard.parsers.ast import SourceScanner
-        from flagguard.analysis import FlagSATSolver, ConflictDetector
-
         # Config
         flags = {}
         for i in range(20):
@@ -416,12 +430,11 @@ class TestEndToEndPerformance:
         # Source files
         src_dir = tmp_path / "src"
         src_dir.mkdir()
-        for i in range(10):
-            (src_dir / f"module_{i}.py").write_text(
-                f'if is_enabled("flag_{i}"): pass\nif is_enabled("flag_{i+10}"): pass'
-            )
+        _write_files({
+            src_dir / f"module_{i}.py": _PY_PAIR_TEMPLATE % (i, i + 10) for i in range(10)
+        })
 
-        start = time.time()
+        start = time.perf_counter_ns()
 
         # Step 1: Parse config
         parsed = parse_config(config_path)
@@ -436,7 +449,7 @@ class TestEndToEndPerformance:
         detector.load_flags(parsed)
         conflicts = detector.detect_all_conflicts()
 
-        total_duration = time.time() - start
+        total_duration = (time.perf_counter_ns() - start) / 1e9
 
         assert len(parsed) == 20
         assert usages.files_scanned == 10
@@ -444,10 +457,6 @@ class TestEndToEndPerformance:
 
     def test_full_pipeline_medium(self, tmp_path: Path) -> None:
         """End-to-end: 100 flags + 50 source files."""
-        from flagguard.parsers import parse_config
-        from flagguard.parsers.ast import SourceScanner
-        from flagguard.analysis import FlagSATSolver, ConflictDetector
-
         # Config
         flags = {}
         for i in range(100):
@@ -463,12 +472,11 @@ class TestEndToEndPerformance:
         # Source files
         src_dir = tmp_path / "src"
         src_dir.mkdir()
-        for i in range(50):
-            (src_dir / f"service_{i}.py").write_text(
-                f'if is_enabled("flag_{i}"): pass\nif is_enabled("flag_{i+50}"): pass'
-            )
+        _write_files({
+            src_dir / f"service_{i}.py": _PY_PAIR_TEMPLATE % (i, i + 50) for i in range(50)
+        })
 
-        start = time.time()
+        start = time.perf_counter_ns()
 
         parsed = parse_config(config_path)
         scanner = SourceScanner()
@@ -478,7 +486,7 @@ class TestEndToEndPerformance:
         detector.load_flags(parsed)
         conflicts = detector.detect_all_conflicts()
 
-        total_duration = time.time() - start
+        total_duration = (time.perf_counter_ns() - start) / 1e9
 
         assert len(parsed) == 100
         assert usages.files_scanned == 50
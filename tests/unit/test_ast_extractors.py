@@ -4,9 +4,8 @@ from pathlib import Path
 
 import pytest
 
-from flagguard.parsers.ast.python import PythonFlagExtractor
-from flagguard.parsers.ast.javascript import JavaScriptFlagExtractor
 from flagguard.parsers.ast.scanner import SourceScanner
+from flagguard.parsers.ast.prefilter import TokenPrefilter
 from flagguard.parsers.ast.languages import (
     SupportedLanguage,
     get_language_for_file,
@@ -48,7 +47,7 @@ class TestLanguageRegistry:
 class TestPythonFlagExtractor:
     """Tests for Python flag extractor."""
     
-    def test_extract_simple_function_call(self, tmp_path: Path) -> None:
+    def test_extract_simple_function_call(self, tmp_path: Path, python_extractor) -> None:
         """Test extracting simple is_enabled calls."""
         code = '''
 def test():
@@ -58,14 +57,13 @@ def test():
         file_path = tmp_path / "test.py"
         file_path.write_text(code)
         
-        extractor = PythonFlagExtractor()
-        usages = extractor.extract(file_path)
+        usages = python_extractor.extract(file_path)
         
         assert len(usages) == 1
         assert usages[0].flag_name == "my_flag"
         assert usages[0].containing_function == "test"
     
-    def test_extract_method_call(self, tmp_path: Path) -> None:
+    def test_extract_method_call(self, tmp_path: Path, python_extractor) -> None:
         """Test extracting method calls like flags.is_enabled()."""
         code = '''
 def process():
@@ -75,13 +73,12 @@ def process():
         file_path = tmp_path / "test.py"
         file_path.write_text(code)
         
-        extractor = PythonFlagExtractor()
-        usages = extractor.extract(file_path)
+        usages = python_extractor.extract(file_path)
         
         assert len(usages) == 1
         assert usages[0].flag_name == "feature_x"
     
-    def test_extract_negated_check(self, tmp_path: Path) -> None:
+    def test_extract_negated_check(self, tmp_path: Path, python_extractor) -> None:
         """Test detecting negated flag checks."""
         code = '''
 def check():
@@ -91,14 +88,13 @@ def check():
         file_path = tmp_path / "test.py"
         file_path.write_text(code)
         
-        extractor = PythonFlagExtractor()
-        usages = extractor.extract(file_path)
+        usages = python_extractor.extract(file_path)
         
         assert len(usages) == 1
         assert usages[0].flag_name == "legacy_mode"
         assert usages[0].negated is True
     
-    def test_extract_class_method(self, tmp_path: Path) -> None:
+    def test_extract_class_method(self, tmp_path: Path, python_extractor) -> None:
         """Test extracting from class methods."""
         code = '''
 class MyClass:
@@ -109,15 +105,14 @@ class MyClass:
         file_path = tmp_path / "test.py"
         file_path.write_text(code)
         
-        extractor = PythonFlagExtractor()
-        usages = extractor.extract(file_path)
+        usages = python_extractor.extract(file_path)
         
         assert len(usages) == 1
         assert usages[0].flag_name == "class_feature"
         assert usages[0].containing_class == "MyClass"
         assert usages[0].containing_function == "method"
     
-    def test_extract_multiple_flags(self, tmp_path: Path) -> None:
+    def test_extract_multiple_flags(self, tmp_path: Path, python_extractor) -> None:
         """Test extracting multiple flags from one file."""
         code = '''
 def multi():
@@ -131,22 +126,82 @@ def multi():
         file_path = tmp_path / "test.py"
         file_path.write_text(code)
         
-        extractor = PythonFlagExtractor()
-        usages = extractor.extract(file_path)
+        usages = python_extractor.extract(file_path)
         
         flag_names = {u.flag_name for u in usages}
         assert "flag_a" in flag_names
         assert "flag_b" in flag_names
         # has_feature should also be detected
-    
-    def test_extract_from_fixture(self, python_sample_dir: Path) -> None:
+
+    def test_regex_fallback_containing_function(self, tmp_path: Path, python_extractor) -> None:
+        """Test the regex fallback resolves the enclosing function."""
+        code = '''
+if is_enabled("module_flag"):
+    pass
+
+def outer():
+    if is_enabled("flag_a") and is_enabled("flag_b"):
+        pass
+
+class Widget:
+    enabled = is_enabled("class_flag")
+'''
+        usages = python_extractor._extract_with_regex(tmp_path / "test.py", code)
+
+        functions = {u.flag_name: u.containing_function for u in usages}
+        assert functions == {
+            "module_flag": None,
+            "flag_a": "outer",
+            "flag_b": "outer",
+            "class_flag": None,
+        }
+
+    def test_extract_cache_tracks_changes(self, tmp_path: Path, python_extractor) -> None:
+        """Test repeated extraction is cached until the file changes."""
+        file_path = tmp_path / "test.py"
+        file_path.write_text('is_enabled("first")')
+
+        first = python_extractor.extract(file_path)
+        assert python_extractor.extract(file_path) == first
+
+        file_path.write_text('is_enabled("second_flag")')
+
+        assert [u.flag_name for u in python_extractor.extract(file_path)] == ["second_flag"]
+
+    def test_extract_cache_returns_copies(self, tmp_path: Path, python_extractor) -> None:
+        """Test changing a cached result does not affect later extractions."""
+        file_path = tmp_path / "test.py"
+        file_path.write_text('is_enabled("flag")')
+
+        python_extractor.extract(file_path)[0].flag_name = "changed"
+
+        assert python_extractor.extract(file_path)[0].flag_name == "flag"
+
+    def test_extract_uncached_by_default(self, tmp_path: Path) -> None:
+        """Test extractors only cache results when asked to."""
+        from flagguard.parsers.ast.python import _EXTRACT_CACHE, PythonFlagExtractor
+
+        file_path = tmp_path / "test.py"
+        file_path.write_text('is_enabled("flag")')
+
+        PythonFlagExtractor().extract(file_path)
+
+        assert not any(key[0] == str(file_path) for key in _EXTRACT_CACHE)
+
+    def test_extract_skips_binary_file(self, tmp_path: Path, python_extractor) -> None:
+        """Test files with NUL bytes are skipped even if they mention a flag."""
+        file_path = tmp_path / "test.py"
+        file_path.write_bytes(b'\x00\xff is_enabled("hidden")')
+
+        assert python_extractor.extract(file_path) == []
+
+    def test_extract_from_fixture(self, python_sample_dir: Path, python_extractor) -> None:
         """Test extraction from the Python sample fixture."""
         sample_file = python_sample_dir / "app.py"
         if not sample_file.exists():
             pytest.skip("Python sample fixture not found")
         
-        extractor = PythonFlagExtractor()
-        usages = extractor.extract(sample_file)
+        usages = python_extractor.extract(sample_file)
         
         # Should find multiple flag usages
         assert len(usages) > 0
@@ -157,7 +212,7 @@ def multi():
 class TestJavaScriptFlagExtractor:
     """Tests for JavaScript flag extractor."""
     
-    def test_extract_method_call(self, tmp_path: Path) -> None:
+    def test_extract_method_call(self, tmp_path: Path, javascript_extractor) -> None:
         """Test extracting method calls like flags.isEnabled()."""
         code = '''
 function test() {
@@ -169,13 +224,12 @@ function test() {
         file_path = tmp_path / "test.js"
         file_path.write_text(code)
         
-        extractor = JavaScriptFlagExtractor()
-        usages = extractor.extract(file_path)
+        usages = javascript_extractor.extract(file_path)
         
         assert len(usages) == 1
         assert usages[0].flag_name == "my_flag"
     
-    def test_extract_launchdarkly_variation(self, tmp_path: Path) -> None:
+    def test_extract_launchdarkly_variation(self, tmp_path: Path, javascript_extractor) -> None:
         """Test extracting LaunchDarkly variation calls."""
         code = '''
 function getFeature(user) {
@@ -185,13 +239,12 @@ function getFeature(user) {
         file_path = tmp_path / "test.js"
         file_path.write_text(code)
         
-        extractor = JavaScriptFlagExtractor()
-        usages = extractor.extract(file_path)
+        usages = javascript_extractor.extract(file_path)
         
         assert len(usages) == 1
         assert usages[0].flag_name == "feature_x"
     
-    def test_extract_negated_check(self, tmp_path: Path) -> None:
+    def test_extract_negated_check(self, tmp_path: Path, javascript_extractor) -> None:
         """Test detecting negated flag checks in JS."""
         code = '''
 function check() {
@@ -203,20 +256,40 @@ function check() {
         file_path = tmp_path / "test.js"
         file_path.write_text(code)
         
-        extractor = JavaScriptFlagExtractor()
-        usages = extractor.extract(file_path)
+        usages = javascript_extractor.extract(file_path)
         
         assert len(usages) == 1
         assert usages[0].negated is True
     
-    def test_extract_from_fixture(self, javascript_sample_dir: Path) -> None:
+    def test_extract_context(self, tmp_path: Path, javascript_extractor) -> None:
+        """Test enclosing function, class and check type are resolved."""
+        code = '''
+class Checkout {
+    render() {
+        const legacy = flags["legacy_cart"];
+        return flags.isEnabled(`dynamic_${legacy}`) ? "a" : "b";
+    }
+}
+const helper = () => isEnabled('arrow_flag');
+'''
+        file_path = tmp_path / "test.js"
+        file_path.write_text(code)
+        
+        usages = javascript_extractor.extract(file_path)
+        
+        assert [(u.flag_name, u.containing_function, u.containing_class, u.check_type)
+                for u in usages] == [
+            ("legacy_cart", "render", "Checkout", "assignment"),
+            ("arrow_flag", "helper", None, "assignment"),
+        ]
+    
+    def test_extract_from_fixture(self, javascript_sample_dir: Path, javascript_extractor) -> None:
         """Test extraction from the JavaScript sample fixture."""
         sample_file = javascript_sample_dir / "app.js"
         if not sample_file.exists():
             pytest.skip("JavaScript sample fixture not found")
         
-        extractor = JavaScriptFlagExtractor()
-        usages = extractor.extract(sample_file)
+        usages = javascript_extractor.extract(sample_file)
         
         # Should find multiple flag usages
         assert len(usages) > 0
@@ -224,6 +297,46 @@ function check() {
         assert "premium_checkout" in flag_names
 
 
+class TestTokenPrefilter:
+    """Tests for the source token pre-scan."""
+    
+    def test_matches_any_token(self) -> None:
+        """Test any single token is enough to match."""
+        prefilter = TokenPrefilter((b"is_enabled", b"flags"))
+        
+        assert prefilter(b"x = flags['a']")
+        assert prefilter(bytearray(b"if is_enabled('a'):"))
+        assert not prefilter(b"import os")
+    
+    def test_memory_mapped_input(self, tmp_path: Path, monkeypatch) -> None:
+        """Test the find() fallback accepts memory-mapped files."""
+        import mmap
+        from flagguard.parsers.ast import prefilter as prefilter_module
+        
+        monkeypatch.setattr(prefilter_module, "HYPERSCAN_AVAILABLE", False)
+        file_path = tmp_path / "big.py"
+        file_path.write_bytes(b"#" * 10000 + b"flags")
+        prefilter = TokenPrefilter((b"flags",))
+        
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            assert prefilter(mm)
+            assert not TokenPrefilter((b"is_enabled",))(mm)
+    
+    def test_hyperscan_memory_mapped_input(self, tmp_path: Path) -> None:
+        """Test the Hyperscan path on memory-mapped files."""
+        pytest.importorskip("hyperscan")
+        import mmap
+        
+        file_path = tmp_path / "big.py"
+        # A match near the start ends the scan via ScanTerminated
+        file_path.write_bytes(b"flags" + b"#" * 10000 + b"flags")
+        prefilter = TokenPrefilter((b"flags",))
+        
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            assert prefilter(mm)
+            assert not TokenPrefilter((b"is_enabled",))(mm)
+
+
 class TestSourceScanner:
     """Tests for unified source scanner."""
     
@@ -268,6 +381,34 @@ def helper():
         assert "should_find" in flag_names
         assert "should_skip" not in flag_names
     
+    def test_parallel_scan_matches_serial(self, tmp_path: Path, monkeypatch) -> None:
+        """Test worker-process scanning finds the same usages in order."""
+        for i in range(6):
+            (tmp_path / f"mod_{i}.py").write_text(f'is_enabled("py_{i}")')
+            (tmp_path / f"mod_{i}.js").write_text(f'flags.isEnabled("js_{i}")')
+
+        serial = SourceScanner(max_workers=1).scan_directory(tmp_path)
+        monkeypatch.setattr(SourceScanner, "PARALLEL_MIN_FILES", 1)
+        parallel = SourceScanner(max_workers=2).scan_directory(tmp_path)
+
+        assert parallel.files_scanned == serial.files_scanned == 12
+        assert parallel.usages == serial.usages
+
+    def test_parallel_scan_uses_scanner_config(self, tmp_path: Path, monkeypatch) -> None:
+        """Test worker processes scan with the parent scanner's class and settings."""
+        for i in range(3):
+            (tmp_path / f"mod_{i}.py").write_text(f'is_enabled("py_{i}")')
+            (tmp_path / f"mod_{i}.js").write_text(f'flags.isEnabled("js_{i}")')
+
+        monkeypatch.setattr(SourceScanner, "PARALLEL_MIN_FILES", 1)
+        db = _PythonOnlyScanner(max_workers=2).scan_directory(tmp_path)
+
+        assert db.get_unique_flags() == {"py_0", "py_1", "py_2"}
+
+    def test_scan_is_serial_by_default(self) -> None:
+        """Test scanners only start worker processes when asked to."""
+        assert SourceScanner().max_workers == 1
+
     def test_scan_mixed_languages(self, tmp_path: Path) -> None:
         """Test scanning directory with mixed languages."""
         (tmp_path / "app.py").write_text('is_enabled("py_flag")')
@@ -281,6 +422,14 @@ def helper():
         assert len(db.usages) >= 2
 
 
+class _PythonOnlyScanner(SourceScanner):
+    """Scanner with a non-default extractor setup, for worker tests."""
+
+    def _setup_extractors(self) -> None:
+        super()._setup_extractors()
+        self._extractors = {".py": self._extractors[".py"]}
+
+
 # Fixtures
 @pytest.fixture
 def python_sample_dir() -> Path:
@@ -0,0 +1,49 @@
+"""Unit tests for the LLM explanation engine."""
+
+from flagguard.core.models import Conflict, ConflictSeverity
+from flagguard.llm.explainer import ExplanationEngine
+
+
+class AvailableClient:
+    """Stand-in for a connected OllamaClient."""
+
+    is_available = True
+
+
+class IdEngine(ExplanationEngine):
+    """Engine whose explanation is the conflict id, to check ordering."""
+
+    def explain_conflict(self, conflict: Conflict) -> str:
+        return conflict.conflict_id
+
+
+def _conflict(i: int) -> Conflict:
+    return Conflict(
+        conflict_id=f"C{i:06d}",
+        flags_involved=[f"flag_{i}", "shared"],
+        conflicting_values={f"flag_{i}": True, "shared": True},
+        severity=ConflictSeverity.HIGH,
+        reason="Mutually exclusive",
+    )
+
+
+class TestExplanationEngine:
+    """Tests for ExplanationEngine."""
+
+    def test_explain_conflicts_preserves_order(self) -> None:
+        """Concurrent explanations line up with their conflicts."""
+        conflicts = [_conflict(i) for i in range(6)]
+        engine = IdEngine(AvailableClient())
+
+        explanations = engine.explain_conflicts(conflicts, max_workers=3)
+
+        assert explanations == [c.conflict_id for c in conflicts]
+
+    def test_explain_conflicts_without_llm_uses_templates(self) -> None:
+        """Template fallback is used when the LLM is disabled."""
+        conflicts = [_conflict(i) for i in range(2)]
+        engine = ExplanationEngine(AvailableClient(), use_llm=False)
+
+        explanations = engine.explain_conflicts(conflicts)
+
+        assert explanations == [engine._template_conflict_explanation(c) for c in conflicts]
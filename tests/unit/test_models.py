@@ -0,0 +1,13 @@
+"""Unit tests for core data models."""
+
+from flagguard.core.models import FlagUsage
+
+
+class TestFlagUsage:
+    """Tests for the FlagUsage model."""
+
+    def test_flag_usage_is_slotted(self) -> None:
+        """Usages are slotted so large scans stay compact."""
+        usage = FlagUsage(flag_name="f", file_path="app.py", line_number=1)
+
+        assert not hasattr(usage, "__dict__")
@@ -10,7 +10,7 @@ from flagguard.parsers.base import BaseParser, ParserError
 from flagguard.parsers.launchdarkly import LaunchDarklyParser
 from flagguard.parsers.generic import GenericParser
 from flagguard.parsers.unleash import UnleashParser
-from flagguard.parsers.factory import parse_config, get_parser
+from flagguard.parsers.factory import parse_config, parse_config_text, get_parser
 
 
 # ─────────────────────────────────────────────────────────────────
@@ -39,12 +39,11 @@ class TestLaunchDarklyParser:
         assert flags[0].enabled is True
         assert flags[0].flag_type == FlagType.BOOLEAN
 
-    def test_parse_with_prerequisites(self, sample_launchdarkly_config: Path) -> None:
+    def test_parse_with_prerequisites(self, sample_launchdarkly_content: str) -> None:
         """Test parsing flags with prerequisites."""
         parser = LaunchDarklyParser()
-        content = sample_launchdarkly_config.read_text()
 
-        flags = parser.parse(content)
+        flags = parser.parse(sample_launchdarkly_content)
 
         # Find new_checkout flag
         checkout = next(f for f in flags if f.name == "new_checkout")
@@ -174,6 +173,27 @@ class TestLaunchDarklyParser:
         assert "ui" in flags[0].tags
         assert "checkout" in flags[0].tags
 
+    def test_parse_rule_rollout_percentage(self) -> None:
+        """Rule rollout weights are converted to percentages."""
+        parser = LaunchDarklyParser()
+        config = json.dumps({
+            "flags": {
+                "rolled_out": {
+                    "variations": [True, False],
+                    "rules": [
+                        {"id": "partial", "rollout": {"variations": [{"weight": 25000}]}},
+                        {"id": "fixed", "variation": 1},
+                        {"id": "empty", "rollout": {"variations": []}},
+                    ],
+                }
+            }
+        })
+
+        rules = parser.parse(config)[0].targeting_rules
+
+        assert [r.rollout_percentage for r in rules] == [25.0, 100.0, 100.0]
+        assert rules[1].variation == "variation_1"
+
     def test_parse_file_method(self, sample_launchdarkly_config: Path) -> None:
         """Test parse_file convenience method."""
         parser = LaunchDarklyParser()
@@ -181,6 +201,33 @@ class TestLaunchDarklyParser:
 
         assert len(flags) > 0
 
+    def test_parse_stream_matches_parse(self, sample_launchdarkly_config: Path) -> None:
+        """Streaming parse yields the same flags as the in-memory parse."""
+        pytest.importorskip("ijson")
+        parser = LaunchDarklyParser()
+
+        expected = parser.parse(sample_launchdarkly_config.read_text())
+
+        assert parser.parse_stream(sample_launchdarkly_config) == expected
+
+    def test_parse_stream_flags_not_object(self, tmp_path: Path) -> None:
+        """Streaming parse rejects a non-object 'flags' value."""
+        pytest.importorskip("ijson")
+        config_path = tmp_path / "flags.json"
+        config_path.write_text('{"flags": [{"key": "a"}]}')
+
+        with pytest.raises(ParserError, match="'flags' to be an object"):
+            LaunchDarklyParser().parse_stream(config_path)
+
+    def test_parse_stream_invalid_json(self, tmp_path: Path) -> None:
+        """Streaming parse reports malformed input as ParserError."""
+        pytest.importorskip("ijson")
+        config_path = tmp_path / "flags.json"
+        config_path.write_text('{"flags": {"a": ')
+
+        with pytest.raises(ParserError, match="Invalid JSON"):
+            LaunchDarklyParser().parse_stream(config_path)
+
 
 # ─────────────────────────────────────────────────────────────────
 # Generic Parser Tests
@@ -203,12 +250,11 @@ class TestGenericParser:
         assert flags[0].name == "flag_a"
         assert flags[1].name == "flag_b"
 
-    def test_parse_object_format(self, sample_generic_config: Path) -> None:
+    def test_parse_object_format(self, sample_generic_content: str) -> None:
         """Test parsing object format with flags array."""
         parser = GenericParser()
-        content = sample_generic_config.read_text()
 
-        flags = parser.parse(content)
+        flags = parser.parse(sample_generic_content)
 
         assert len(flags) == 3
 
@@ -250,6 +296,17 @@ class TestGenericParser:
         with pytest.raises(ParserError):
             parser.parse("not valid json")
 
+    def test_stdlib_fallback(self, sample_generic_content: str, monkeypatch) -> None:
+        """Parsing works the same without orjson installed."""
+        from flagguard.parsers import generic
+
+        expected = GenericParser().parse(sample_generic_content)
+        monkeypatch.setattr(generic, "ORJSON_AVAILABLE", False)
+
+        assert GenericParser().parse(sample_generic_content) == expected
+        with pytest.raises(ParserError, match="Invalid JSON"):
+            GenericParser().parse("not valid json")
+
     def test_parse_flag_with_all_fields(self) -> None:
         """Flag with type, description, and dependencies."""
         parser = GenericParser()
@@ -414,6 +471,16 @@ features: []
         assert len(flags) == 1
         assert flags[0].name == "json-feature"
 
+    def test_parse_yaml_flow_mapping(self) -> None:
+        """YAML flow mappings that look like JSON still parse as YAML."""
+        parser = UnleashParser()
+
+        flags = parser.parse("{features: [{name: flow-feature, enabled: false}]}")
+
+        assert len(flags) == 1
+        assert flags[0].name == "flow-feature"
+        assert flags[0].enabled is False
+
     def test_parse_malformed_yaml_raises(self) -> None:
         """Malformed YAML/JSON should raise ParserError."""
         parser = UnleashParser()
@@ -534,6 +601,14 @@ class TestParserFactory:
         flags = parse_config(sample_generic_config)
         assert len(flags) == 3
 
+    def test_parse_config_text_matches_file(self, sample_generic_config: Path) -> None:
+        """Parsing already-read content matches parsing the file."""
+        content = sample_generic_config.read_text()
+
+        from_text = parse_config_text(content)
+
+        assert from_text == parse_config(sample_generic_config)
+
     def test_parse_config_file_not_found(self, tmp_path: Path) -> None:
         """Test error for missing file."""
         with pytest.raises(FileNotFoundError):
@@ -544,6 +619,31 @@ class TestParserFactory:
         flags = parse_config(sample_launchdarkly_config)
         assert len(flags) > 0
 
+    def test_parse_config_large_launchdarkly(
+        self, sample_launchdarkly_config: Path, monkeypatch
+    ) -> None:
+        """Large exports take the parse_file path with the same result."""
+        from flagguard.parsers import launchdarkly
+
+        expected = parse_config(sample_launchdarkly_config)
+        monkeypatch.setattr(launchdarkly, "STREAM_MIN_SIZE", 0)
+
+        assert parse_config(sample_launchdarkly_config) == expected
+        assert parse_config(sample_launchdarkly_config, "launchdarkly") == expected
+
+    def test_parse_config_large_launchdarkly_flags_not_object(
+        self, tmp_path: Path, monkeypatch
+    ) -> None:
+        """Large exports reject a non-object 'flags' like small ones do."""
+        from flagguard.parsers import launchdarkly
+
+        config_path = tmp_path / "flags.json"
+        config_path.write_text('{"flags": [{"key": "a"}]}')
+        monkeypatch.setattr(launchdarkly, "STREAM_MIN_SIZE", 0)
+
+        with pytest.raises(ParserError, match="'flags' to be an object"):
+            parse_config(config_path, "launchdarkly")
+
     def test_parse_yaml_auto_detect(self, tmp_path: Path) -> None:
         """Auto-detect YAML format as Unleash."""
         yaml_path = tmp_path / "config.yaml"
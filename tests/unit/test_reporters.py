@@ -0,0 +1,145 @@
+"""Unit tests for report generators."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from flagguard.core.models import (
+    Conflict,
+    ConflictSeverity,
+    ConflictType,
+    DeadCodeBlock,
+    FlagDefinition,
+    FlagType,
+)
+from flagguard.reporters import JSONReporter, MarkdownReporter
+
+
+@pytest.fixture
+def report_inputs() -> tuple[list, list, list]:
+    """Flags, conflicts and dead blocks covering every report section."""
+    flags = [
+        FlagDefinition(name="checkout", flag_type=FlagType.BOOLEAN, enabled=True,
+                       dependencies=["payments"]),
+        FlagDefinition(name="payments", flag_type=FlagType.BOOLEAN, enabled=False),
+        FlagDefinition(name="theme", flag_type=FlagType.STRING, enabled=True),
+    ]
+    conflicts = [
+        Conflict(
+            conflict_id="C000001",
+            flags_involved=["checkout", "theme"],
+            conflicting_values={"checkout": True, "theme": True},
+            severity=ConflictSeverity.CRITICAL,
+            reason="Mutually exclusive",
+        ),
+        Conflict(
+            conflict_id="D000001",
+            flags_involved=["checkout", "payments"],
+            conflicting_values={"checkout": True, "payments": False},
+            severity=ConflictSeverity.HIGH,
+            conflict_type=ConflictType.DEPENDENCY_VIOLATION,
+            reason="Missing dependency",
+        ),
+    ]
+    dead_blocks = [
+        DeadCodeBlock(file_path="app.py", start_line=10, end_line=14,
+                      required_flags={"payments": True}, reason="Always off"),
+        DeadCodeBlock(file_path="app.py", start_line=30, end_line=30,
+                      required_flags={"payments": True}, reason="Always off"),
+        DeadCodeBlock(file_path="api.py", start_line=1, end_line=2,
+                      required_flags={"payments": True}, reason="Always off"),
+    ]
+    return flags, conflicts, dead_blocks
+
+
+class TestJSONReporter:
+    """Tests for the JSON reporter."""
+
+    def test_summary_and_statistics(self, report_inputs) -> None:
+        """Summary totals and statistics are computed correctly."""
+        report = JSONReporter().generate_report(*report_inputs)
+
+        assert report["summary"]["total_flags"] == 3
+        assert report["summary"]["total_dead_lines"] == 8
+        assert report["summary"]["status"] == "fail"
+        assert report["statistics"] == {
+            "conflict_severity": {"critical": 1, "high": 1, "medium": 0, "low": 0},
+            "flag_types": {"boolean": 2, "string": 1},
+            "enabled_flags": 2,
+            "disabled_flags": 1,
+            "flags_with_dependencies": 1,
+            "dead_code_files": 2,
+        }
+
+    def test_save_round_trips(self, report_inputs, tmp_path: Path) -> None:
+        """Saved reports decode back to the same data."""
+        reporter = JSONReporter()
+        report = reporter.generate_report(*report_inputs)
+        path = tmp_path / "report.json"
+
+        reporter.save(report, path)
+
+        assert json.loads(path.read_text(encoding="utf-8")) == report
+        assert json.loads(reporter.to_string(report, pretty=False)) == report
+        assert json.loads(reporter.to_bytes(report)) == report
+
+    def test_stdlib_fallback(self, report_inputs, monkeypatch) -> None:
+        """Serialization works without orjson installed."""
+        from flagguard.reporters import json_reporter
+
+        monkeypatch.setattr(json_reporter, "ORJSON_AVAILABLE", False)
+        reporter = JSONReporter()
+        report = reporter.generate_report(*report_inputs)
+
+        assert json.loads(reporter.to_bytes(report)) == report
+        assert reporter.to_string(report) == json.dumps(report, indent=2, default=str)
+
+
+class TestMarkdownReporter:
+    """Tests for the Markdown reporter."""
+
+    def test_report_sections(self, report_inputs) -> None:
+        """All sections are rendered for a report with issues."""
+        report = MarkdownReporter().generate_report(*report_inputs)
+
+        assert report.startswith("# FlagGuard Analysis Report")
+        assert "⚠️ Issues Found" in report
+        assert "### 🔴 C000001: `checkout`, `theme`" in report
+        assert "### ⚠️ D000001: `checkout` → `payments`" in report
+        assert "**Total estimated dead lines:** 8" in report
+        assert "| `checkout` | ✅ | boolean | payments |" in report
+        assert "| `payments` | ❌ | boolean | - |" in report
+
+    def test_healthy_report(self) -> None:
+        """A clean analysis reports a healthy status."""
+        flags = [FlagDefinition(name="solo", flag_type=FlagType.BOOLEAN, enabled=True)]
+
+        report = MarkdownReporter().generate_report(flags, [], [])
+
+        assert "✅ Healthy" in report
+        assert "✅ No mutual exclusion conflicts detected." in report
+        assert "No dead code detected." in report
+
+    def test_large_inventory_is_summarized(self) -> None:
+        """Flag inventories above the inline limit collapse to a note."""
+        flags = [
+            FlagDefinition(name=f"flag_{i}", flag_type=FlagType.BOOLEAN, enabled=True)
+            for i in range(3)
+        ]
+
+        report = MarkdownReporter(max_inline_flags=2).generate_report(flags, [], [])
+
+        assert "**3** flags analyzed" in report
+        assert "| `flag_0` |" not in report
+
+    def test_flags_table_escapes_cells(self) -> None:
+        """Pipes and backticks cannot break the inventory table."""
+        flags = [
+            FlagDefinition(name="a|b", flag_type=FlagType.BOOLEAN, enabled=True,
+                           dependencies=["x|`y`"]),
+        ]
+
+        report = MarkdownReporter().generate_report(flags, [], [])
+
+        assert "| `a\\|b` | ✅ | boolean | x\\|\\`y\\` |" in report
@@ -9,6 +9,25 @@ try:
 except ImportError:
     Z3_AVAILABLE = False
 
+from flagguard.analysis.conflict_detector import ConflictDetector
+from flagguard.analysis.constraint_encoder import ConstraintEncoder
+from flagguard.analysis.dead_code import DeadCodeFinder
+from flagguard.analysis.z3_wrapper import TRUTH_TABLE_MAX_FLAGS, FlagSATSolver, _bool_term
+from flagguard.core.models import FlagDefinition, FlagType, FlagUsage
+
+
+@pytest.fixture(scope="module")
+def shared_solver() -> FlagSATSolver:
+    """One solver object for the module, reset between tests by `solver`."""
+    return FlagSATSolver()
+
+
+@pytest.fixture
+def solver(shared_solver: FlagSATSolver) -> FlagSATSolver:
+    """The shared solver, reset so no constraints leak between tests."""
+    shared_solver.reset()
+    return shared_solver
+
 
 # ─────────────────────────────────────────────────────────────────
 # SAT Solver Core Tests
@@ -18,55 +37,41 @@ except ImportError:
 class TestFlagSATSolver:
     """Tests for the Z3 wrapper."""
 
-    def test_solver_initialization(self) -> None:
+    def test_solver_initialization(self, solver: FlagSATSolver) -> None:
         """Test solver initializes correctly."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
         assert solver.is_available is True
 
-    def test_create_variable(self) -> None:
+    def test_create_variable(self, solver: FlagSATSolver) -> None:
         """Test creating boolean variables."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
         var = solver.get_or_create_var("test_flag")
 
         assert var is not None
         assert "test_flag" in solver.variables
 
-    def test_duplicate_variable_returns_same(self) -> None:
+    def test_duplicate_variable_returns_same(self, solver: FlagSATSolver) -> None:
         """Getting same variable twice returns identical reference."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
         var1 = solver.get_or_create_var("flag_a")
         var2 = solver.get_or_create_var("flag_a")
 
         assert var1 is var2
         assert len(solver.variables) == 1
 
-    def test_requires_constraint(self) -> None:
-        """Test dependency constraint encoding."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
+    @pytest.mark.parametrize("state,expected", [
+        ({"feature_a": True, "feature_b": True}, True),
+        ({"feature_a": True, "feature_b": False}, False),
+        ({"feature_a": False, "feature_b": True}, True),
+        ({"feature_a": False, "feature_b": False}, True),
+    ])
+    def test_requires_constraint(
+        self, solver: FlagSATSolver, state: dict[str, bool], expected: bool
+    ) -> None:
+        """Only A=True with B=False violates "A requires B"."""
         solver.add_requires("feature_a", "feature_b")
 
-        # A=True, B=True should be possible
-        assert solver.check_state_possible({"feature_a": True, "feature_b": True})
+        assert solver.check_state_possible(state) is expected
 
-        # A=True, B=False should be impossible
-        assert not solver.check_state_possible({"feature_a": True, "feature_b": False})
-
-        # A=False, B=anything should be possible
-        assert solver.check_state_possible({"feature_a": False, "feature_b": False})
-
-    def test_chained_dependencies(self) -> None:
+    def test_chained_dependencies(self, solver: FlagSATSolver) -> None:
         """Test A→B→C→D chain: enabling A requires entire chain."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
         solver.add_requires("d", "c")
         solver.add_requires("c", "b")
         solver.add_requires("b", "a")
@@ -82,28 +87,22 @@ class TestFlagSATSolver:
         # D=True but b=False should be impossible
         assert not solver.check_state_possible({"d": True, "b": False})
 
-    def test_conflicts_constraint(self) -> None:
-        """Test mutual exclusion constraint."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
+    @pytest.mark.parametrize("state,expected", [
+        ({"premium": True, "free_tier": True}, False),
+        ({"premium": True, "free_tier": False}, True),
+        ({"premium": False, "free_tier": True}, True),
+        ({"premium": False, "free_tier": False}, True),
+    ])
+    def test_conflicts_constraint(
+        self, solver: FlagSATSolver, state: dict[str, bool], expected: bool
+    ) -> None:
+        """Only both True violates a mutual exclusion."""
         solver.add_conflicts("premium", "free_tier")
 
-        # Both True should be impossible
-        assert not solver.check_state_possible({"premium": True, "free_tier": True})
-
-        # One True, one False should be possible
-        assert solver.check_state_possible({"premium": True, "free_tier": False})
-        assert solver.check_state_possible({"premium": False, "free_tier": True})
-
-        # Both False should be possible
-        assert solver.check_state_possible({"premium": False, "free_tier": False})
+        assert solver.check_state_possible(state) is expected
 
-    def test_always_on_constraint(self) -> None:
+    def test_always_on_constraint(self, solver: FlagSATSolver) -> None:
         """Test always-on constraint."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
         solver.add_always_on("required_flag")
 
         # True should be possible
@@ -112,11 +111,8 @@ class TestFlagSATSolver:
         # False should be impossible
         assert not solver.check_state_possible({"required_flag": False})
 
-    def test_always_off_constraint(self) -> None:
+    def test_always_off_constraint(self, solver: FlagSATSolver) -> None:
         """Test always-off constraint."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
         solver.add_always_off("disabled_flag")
 
         # False should be possible
@@ -125,11 +121,41 @@ class TestFlagSATSolver:
         # True should be impossible
         assert not solver.check_state_possible({"disabled_flag": True})
 
-    def test_get_impossible_states(self) -> None:
-        """Test finding impossible states."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
+    def test_state_check_preserves_base_constraints(self, solver: FlagSATSolver) -> None:
+        """State checks leave the solver's constraints in place."""
+        solver.add_always_on("x")
 
-        solver = FlagSATSolver()
+        assert not solver.check_state_possible({"x": False})
+        assert not solver.check_state_possible({"x": False})
+        assert solver.check_state_possible({"x": True})
+
+    def test_assumptions_do_not_persist(self, solver: FlagSATSolver) -> None:
+        """A checked state does not constrain later checks."""
+        solver.add_conflicts("a", "b")
+
+        assert solver.check_state_possible({"a": True})
+        assert solver.check_state_possible({"b": True})
+        assert solver.check_state_possible({"a": False, "b": False})
+
+    def test_pinned_flag_rejected_without_solving(
+        self, solver: FlagSATSolver, monkeypatch
+    ) -> None:
+        """States contradicting an always-on/off flag skip the Z3 check."""
+        for i in range(TRUTH_TABLE_MAX_FLAGS + 1):
+            solver.get_or_create_var(f"flag_{i}")
+        solver.add_always_off("flag_0")
+        solver.add_always_on("flag_1")
+
+        def fail(*assumptions):
+            raise AssertionError("Z3 should not be queried")
+
+        monkeypatch.setattr(solver._solver, "check", fail)
+
+        assert not solver.check_state_possible({"flag_0": True})
+        assert not solver.check_state_possible({"flag_2": True, "flag_1": False})
+
+    def test_get_impossible_states(self, solver: FlagSATSolver) -> None:
+        """Test finding impossible states."""
         solver.add_conflicts("a", "b")
 
         impossible = solver.get_impossible_states(["a", "b"])
@@ -138,11 +164,48 @@ class TestFlagSATSolver:
         assert len(impossible) == 1
         assert impossible[0] == {"a": True, "b": True}
 
-    def test_reset(self) -> None:
-        """Test solver reset."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
+    def test_get_impossible_states_transitive(self, solver: FlagSATSolver) -> None:
+        """Impossible pairs implied through a chain of constraints are found."""
+        solver.add_requires("a", "b")
+        solver.add_requires("b", "c")
+        solver.add_always_off("d")
+
+        impossible = solver.get_impossible_states(["a", "c", "d"])
+
+        assert impossible == [
+            {"a": True, "c": False},
+            {"a": True, "d": True},
+            {"a": False, "d": True},
+            {"c": True, "d": True},
+            {"c": False, "d": True},
+        ]
+
+    def test_repeated_constraints_asserted_once(self, solver: FlagSATSolver) -> None:
+        """Re-adding an identical constraint does not grow the solver."""
+        solver.add_requires("a", "b")
+        solver.add_requires("a", "b")
+        solver.add_conflicts("a", "c")
+        solver.add_conflicts("c", "a")
+
+        assert len(solver._solver.assertions()) == 2
+        assert not solver.check_state_possible({"a": True, "c": True})
 
-        solver = FlagSATSolver()
+    def test_truth_table_handover(self, solver: FlagSATSolver) -> None:
+        """Constraints hold before and after outgrowing the truth table."""
+        solver.add_requires("a", "b")
+        solver.add_always_off("b")
+        assert solver._table is not None
+        assert not solver.check_state_possible({"a": True})
+
+        for i in range(TRUTH_TABLE_MAX_FLAGS):
+            solver.get_or_create_var(f"extra_{i}")
+
+        assert solver._table is None
+        assert not solver.check_state_possible({"a": True})
+        assert solver.check_state_possible({"a": False, "extra_0": True})
+
+    def test_reset(self, solver: FlagSATSolver) -> None:
+        """Test solver reset."""
         solver.get_or_create_var("test")
         solver.add_always_on("test")
 
@@ -152,11 +215,8 @@ class TestFlagSATSolver:
 
         assert len(solver.variables) == 0
 
-    def test_combined_requires_and_conflicts(self) -> None:
+    def test_combined_requires_and_conflicts(self, solver: FlagSATSolver) -> None:
         """Test combining requires + conflicts constraints."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
         # premium requires payment, but payment conflicts with free
         solver.add_requires("premium", "payment")
         solver.add_conflicts("payment", "free")
@@ -171,11 +231,8 @@ class TestFlagSATSolver:
             "premium": True, "payment": True, "free": True
         })
 
-    def test_combined_always_on_and_requires(self) -> None:
+    def test_combined_always_on_and_requires(self, solver: FlagSATSolver) -> None:
         """Always-on flag combined with requires."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
         solver.add_always_on("feature")
         solver.add_requires("feature", "base")
 
@@ -183,11 +240,8 @@ class TestFlagSATSolver:
         assert not solver.check_state_possible({"base": False})
         assert solver.check_state_possible({"base": True, "feature": True})
 
-    def test_impossible_system(self) -> None:
+    def test_impossible_system(self, solver: FlagSATSolver) -> None:
         """System with contradictory constraints should detect impossibility."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
         solver.add_always_on("flag_a")
         solver.add_always_off("flag_a")
 
@@ -195,11 +249,8 @@ class TestFlagSATSolver:
         assert not solver.check_state_possible({"flag_a": True})
         assert not solver.check_state_possible({"flag_a": False})
 
-    def test_many_variables(self) -> None:
+    def test_many_variables(self, solver: FlagSATSolver) -> None:
         """Solver should handle 50+ variables without issue."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-
-        solver = FlagSATSolver()
         for i in range(50):
             solver.get_or_create_var(f"flag_{i}")
 
@@ -215,12 +266,8 @@ class TestFlagSATSolver:
 class TestConflictDetector:
     """Tests for conflict detection."""
 
-    def test_no_conflicts_without_constraints(self) -> None:
+    def test_no_conflicts_without_constraints(self, solver: FlagSATSolver) -> None:
         """Empty solver should find no conflicts."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-        from flagguard.analysis.conflict_detector import ConflictDetector
-
-        solver = FlagSATSolver()
         solver.get_or_create_var("flag_a")
         solver.get_or_create_var("flag_b")
 
@@ -229,13 +276,22 @@ class TestConflictDetector:
 
         assert len(conflicts) == 0
 
-    def test_detects_mutual_exclusion(self) -> None:
-        """Should detect when two flags can't both be true."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-        from flagguard.analysis.conflict_detector import ConflictDetector
-        from flagguard.core.models import FlagDefinition, FlagType
+    def test_detect_all_conflicts_skips_solver(
+        self, solver: FlagSATSolver, monkeypatch
+    ) -> None:
+        """Conflict detection reads the loaded flags without querying Z3."""
+        solver.get_or_create_var("flag_a")
+        solver.get_or_create_var("flag_b")
+
+        def fail(*assumptions):
+            raise AssertionError("Z3 should not be queried")
+
+        monkeypatch.setattr(solver._solver, "check", fail)
 
-        solver = FlagSATSolver()
+        assert ConflictDetector(solver).detect_all_conflicts() == []
+
+    def test_detects_mutual_exclusion(self, solver: FlagSATSolver) -> None:
+        """Should detect when two flags can't both be true."""
         detector = ConflictDetector(solver)
 
         flags = [
@@ -265,12 +321,8 @@ class TestConflictDetector:
             for c in conflicts
         )
 
-    def test_detects_dependency_conflict(self) -> None:
+    def test_detects_dependency_conflict(self, solver: FlagSATSolver) -> None:
         """Should detect when a dependency can't be satisfied."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-        from flagguard.analysis.conflict_detector import ConflictDetector
-
-        solver = FlagSATSolver()
         # A requires B, but B is always off
         solver.add_requires("feature_a", "feature_b")
         solver.add_always_off("feature_b")
@@ -281,13 +333,8 @@ class TestConflictDetector:
         conflict = detector.check_state({"feature_a": True})
         assert conflict is not None
 
-    def test_load_flags(self) -> None:
+    def test_load_flags(self, solver: FlagSATSolver) -> None:
         """Test loading flag definitions."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-        from flagguard.analysis.conflict_detector import ConflictDetector
-        from flagguard.core.models import FlagDefinition, FlagType
-
-        solver = FlagSATSolver()
         detector = ConflictDetector(solver)
 
         flags = [
@@ -312,13 +359,8 @@ class TestConflictDetector:
         conflict = detector.check_state({"child": True, "parent": False})
         assert conflict is not None
 
-    def test_load_multiple_flags_with_mixed_states(self) -> None:
+    def test_load_multiple_flags_with_mixed_states(self, solver: FlagSATSolver) -> None:
         """Load flags with mix of enabled/disabled states."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-        from flagguard.analysis.conflict_detector import ConflictDetector
-        from flagguard.core.models import FlagDefinition, FlagType
-
-        solver = FlagSATSolver()
         detector = ConflictDetector(solver)
 
         flags = [
@@ -350,13 +392,8 @@ class TestConflictDetector:
         conflict = detector.check_state({"depends_on_deprecated": True, "deprecated": False})
         assert conflict is not None
 
-    def test_load_chained_flags(self) -> None:
+    def test_load_chained_flags(self, solver: FlagSATSolver) -> None:
         """Load flags with chained dependencies A→B→C."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-        from flagguard.analysis.conflict_detector import ConflictDetector
-        from flagguard.core.models import FlagDefinition, FlagType
-
-        solver = FlagSATSolver()
         detector = ConflictDetector(solver)
 
         flags = [
@@ -386,9 +423,6 @@ class TestConstraintEncoder:
 
     def test_encode_flags(self) -> None:
         """Test encoding flag definitions."""
-        from flagguard.analysis.constraint_encoder import ConstraintEncoder
-        from flagguard.core.models import FlagDefinition, FlagType
-
         encoder = ConstraintEncoder()
 
         flags = [
@@ -413,9 +447,6 @@ class TestConstraintEncoder:
 
     def test_encode_dependencies(self) -> None:
         """Test encoding flag dependencies."""
-        from flagguard.analysis.constraint_encoder import ConstraintEncoder
-        from flagguard.core.models import FlagDefinition, FlagType
-
         encoder = ConstraintEncoder()
 
         flags = [
@@ -439,23 +470,38 @@ class TestConstraintEncoder:
         # child=True, parent=False should be impossible
         assert not solver.check_state_possible({"child": True, "parent": False})
 
+    def test_encoders_share_terms_for_identical_flags(self) -> None:
+        """Re-encoding the same flags reuses the Z3 terms already built."""
+        flags = [
+            FlagDefinition(name="parent", flag_type=FlagType.BOOLEAN, enabled=True),
+            FlagDefinition(name="child", flag_type=FlagType.BOOLEAN, enabled=True, dependencies=["parent"]),
+        ]
+
+        ConstraintEncoder().encode_flags(flags)
+        hits = _bool_term.cache_info().hits
+        second = ConstraintEncoder().encode_flags(flags)
+
+        assert _bool_term.cache_info().hits > hits
+        assert not second.check_state_possible({"child": True, "parent": False})
+
     def test_encode_exclusive_flags(self) -> None:
         """Test encoding mutually exclusive flags."""
-        from flagguard.analysis.constraint_encoder import ConstraintEncoder
-
         encoder = ConstraintEncoder()
         encoder.encode_exclusive_flags([["plan_free", "plan_premium", "plan_enterprise"]])
 
-        solver = encoder.solver
+        impossible = encoder.solver.get_impossible_states(
+            ["plan_free", "plan_premium", "plan_enterprise"]
+        )
 
-        # Any two enabled should be impossible
-        assert not solver.check_state_possible({"plan_free": True, "plan_premium": True})
-        assert not solver.check_state_possible({"plan_premium": True, "plan_enterprise": True})
+        # Any two enabled is impossible, and nothing else is
+        assert impossible == [
+            {"plan_free": True, "plan_premium": True},
+            {"plan_free": True, "plan_enterprise": True},
+            {"plan_premium": True, "plan_enterprise": True},
+        ]
 
     def test_encode_required_flags(self) -> None:
         """Test encoding required flags."""
-        from flagguard.analysis.constraint_encoder import ConstraintEncoder
-
         encoder = ConstraintEncoder()
         encoder.encode_required_flags(["auth_enabled", "logging_enabled"])
 
@@ -467,9 +513,6 @@ class TestConstraintEncoder:
 
     def test_encode_chained_dependencies(self) -> None:
         """Encoder should handle deep dependency chains."""
-        from flagguard.analysis.constraint_encoder import ConstraintEncoder
-        from flagguard.core.models import FlagDefinition, FlagType
-
         encoder = ConstraintEncoder()
 
         flags = [
@@ -486,9 +529,6 @@ class TestConstraintEncoder:
 
     def test_encode_mixed_constraints(self) -> None:
         """Combine multiple constraint types in one encoding pass."""
-        from flagguard.analysis.constraint_encoder import ConstraintEncoder
-        from flagguard.core.models import FlagDefinition, FlagType
-
         encoder = ConstraintEncoder()
 
         flags = [
@@ -516,13 +556,8 @@ class TestConstraintEncoder:
 class TestDeadCodeFinder:
     """Tests for dead code detection."""
 
-    def test_find_dead_code(self) -> None:
+    def test_find_dead_code(self, solver: FlagSATSolver) -> None:
         """Test finding unreachable code."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-        from flagguard.analysis.dead_code import DeadCodeFinder
-        from flagguard.core.models import FlagUsage
-
-        solver = FlagSATSolver()
         # feature_a is always off
         solver.add_always_off("feature_a")
 
@@ -548,13 +583,8 @@ class TestDeadCodeFinder:
         assert dead_blocks[0].file_path == "app.py"
         assert dead_blocks[0].start_line == 10
 
-    def test_no_dead_code_for_possible_states(self) -> None:
+    def test_no_dead_code_for_possible_states(self, solver: FlagSATSolver) -> None:
         """Test that reachable code is not flagged."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-        from flagguard.analysis.dead_code import DeadCodeFinder
-        from flagguard.core.models import FlagUsage
-
-        solver = FlagSATSolver()
         # feature_a is always on
         solver.add_always_on("feature_a")
 
@@ -578,13 +608,8 @@ class TestDeadCodeFinder:
         # Should find no dead code
         assert len(dead_blocks) == 0
 
-    def test_dead_code_negated_check(self) -> None:
+    def test_dead_code_negated_check(self, solver: FlagSATSolver) -> None:
         """Negated check for always-on flag should be dead code."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-        from flagguard.analysis.dead_code import DeadCodeFinder
-        from flagguard.core.models import FlagUsage
-
-        solver = FlagSATSolver()
         solver.add_always_on("feature_a")
 
         finder = DeadCodeFinder(solver)
@@ -607,13 +632,8 @@ class TestDeadCodeFinder:
         # Negated check on always-on flag => dead code
         assert len(dead_blocks) == 1
 
-    def test_multiple_dead_code_blocks(self) -> None:
+    def test_multiple_dead_code_blocks(self, solver: FlagSATSolver) -> None:
         """Detect multiple dead code blocks across files."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-        from flagguard.analysis.dead_code import DeadCodeFinder
-        from flagguard.core.models import FlagUsage
-
-        solver = FlagSATSolver()
         solver.add_always_off("old_feature")
         solver.add_always_off("deprecated")
 
@@ -649,13 +669,8 @@ class TestDeadCodeFinder:
         assert "app.py" in files
         assert "service.py" in files
 
-    def test_no_dead_code_unconstrained(self) -> None:
+    def test_no_dead_code_unconstrained(self, solver: FlagSATSolver) -> None:
         """Unconstrained flags should not produce dead code."""
-        from flagguard.analysis.z3_wrapper import FlagSATSolver
-        from flagguard.analysis.dead_code import DeadCodeFinder
-        from flagguard.core.models import FlagUsage
-
-        solver = FlagSATSolver()
         solver.get_or_create_var("flexible_flag")
 
         finder = DeadCodeFinder(solver)
@@ -675,3 +690,30 @@ class TestDeadCodeFinder:
 
         dead_blocks = finder.find_dead_code(usages)
         assert len(dead_blocks) == 0
+
+    def test_dead_code_dedups_usages(self, solver: FlagSATSolver, monkeypatch) -> None:
+        """Repeated usages of a flag state are checked against the solver once."""
+        solver.add_always_off("old_feature")
+        calls = []
+        check = solver.check_state_possible
+        monkeypatch.setattr(
+            solver, "check_state_possible", lambda state: calls.append(state) or check(state)
+        )
+
+        finder = DeadCodeFinder(solver)
+
+        usages = [
+            FlagUsage(
+                flag_name="old_feature",
+                file_path="app.py",
+                line_number=line,
+                column=4,
+                check_type="if",
+            )
+            for line in range(1, 101)
+        ]
+
+        dead_blocks = finder.find_dead_code(usages)
+
+        assert len(dead_blocks) == 100
+        assert calls == [{"old_feature": True}]